@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Copilot functional test scripts
+Result logging, event parsing and result saving used by every tester
+"""
+
+import sys
+import json
+from pathlib import Path
+from datetime import datetime
+from functools import cached_property
+from threading import Lock
+
+# Add the backend to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "packages/pybackend"))
+
+from copilot_agent_cli import CopilotAgentCLI
+
+
+def save_results(results_file: Path, payload: dict) -> None:
+    """Write results as indented JSON, formatting datetimes as ISO 8601"""
+    with open(results_file, "w") as f:
+        json.dump(payload, f, indent=2, default=datetime.isoformat)
+
+
+class FunctionalTester:
+    """Base class holding the CLI under test and the logged results"""
+
+    def __init__(self):
+        self.cli = CopilotAgentCLI()
+        self.test_results = []
+        self._log_lock = Lock()
+        self._parse_cache = {}
+        # Running aggregates so the summary needs no extra passes
+        self._passed = 0
+        self._total_time_ms = 0.0
+
+    @cached_property
+    def sessions_dir(self):
+        """Copilot sessions directory, resolved once and shared by all tests"""
+        return self.cli._get_sessions_directory()
+
+    def parse_events(self, events_file: Path):
+        """Parse events.jsonl via the CLI, reusing results for unchanged files"""
+        st = events_file.stat()
+        key = (str(events_file), st.st_mtime_ns, st.st_size)
+        if key not in self._parse_cache:
+            self._parse_cache[key] = self.cli._parse_events_jsonl(events_file)
+        return self._parse_cache[key]
+
+    def log_test(self, test_name: str, success: bool, details: str, duration: float):
+        """Log test results"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "details": details,
+            "duration_ms": round(duration * 1000, 2),
+            # Formatted to ISO 8601 in one batch by save_results()
+            "timestamp": datetime.now(),
+        }
+        status = "✅ PASS" if success else "❌ FAIL"
+        # Tests may run on worker threads; keep each entry's output together
+        with self._log_lock:
+            self.test_results.append(result)
+            self._passed += success
+            self._total_time_ms += result["duration_ms"]
+            self.record_result(result)
+            print(f"{status} {test_name} ({duration * 1000:.1f}ms)")
+            print(f"   Details: {details}")
+            print()
+
+    def record_result(self, result: dict) -> None:
+        """Hook for extra per-result bookkeeping; called with the log lock held"""
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Run the Copilot functional test scripts concurrently
+Both suites are dominated by Copilot CLI latency and share no state
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS = ["test_copilot_extended.py", "test_copilot_real_world.py"]
+
+
+if __name__ == "__main__":
+    test_dir = Path(__file__).parent
+    processes = [
+        subprocess.Popen([sys.executable, str(test_dir / script)], cwd=test_dir)
+        for script in SCRIPTS
+    ]
+
+    # Exit non-zero if any suite failed
+    sys.exit(max(process.wait() for process in processes))
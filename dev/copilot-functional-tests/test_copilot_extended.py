@@ -4,39 +4,35 @@ Extended real-world functional tests for CopilotAgentCLI
 Tests session resumption, conversation context, and tool usage
 """
 
+import os
+import re
 import sys
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-# Add the backend to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "packages/pybackend"))
+from functional_test_helpers import FunctionalTester, save_results
 
-from copilot_agent_cli import CopilotAgentCLI
+# Case-insensitive keyword alternations, searched in one pass over a response
+_CONTEXT_RE = re.compile(r"comprehension|list|example|for", re.IGNORECASE)
+_FILE_RE = re.compile(r"test|\.py|json|functional", re.IGNORECASE)
 
 
-class ExtendedCopilotTester:
+def _file_size(path: Path) -> int | None:
+    """Return the size of a file, or None if it can't be stat'ed"""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+class ExtendedCopilotTester(FunctionalTester):
     def __init__(self):
-        self.cli = CopilotAgentCLI()
-        self.test_results = []
+        super().__init__()
         self.test_session_id = None
 
-    def log_test(self, test_name: str, success: bool, details: str, duration: float):
-        """Log test results"""
-        result = {
-            "test": test_name,
-            "success": success,
-            "details": details,
-            "duration_ms": round(duration * 1000, 2),
-            "timestamp": datetime.now().isoformat(),
-        }
-        self.test_results.append(result)
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name} ({duration * 1000:.1f}ms)")
-        print(f"   Details: {details}")
-        print()
-
     def test_create_conversation_session(self):
         """Test creating a new conversation session"""
         start_time = time.time()
@@ -46,18 +42,23 @@ class ExtendedCopilotTester:
             message = "I'm working on a Python project. Can you help me understand list comprehensions? Give a brief explanation."
             result = self.cli.run_agent(message, None, None, None, Path("."))
 
-            success = result.success and len(result.response_parts) > 0
+            response_parts = result.response_parts
+            session_id = result.session_id
+
+            success = result.success and len(response_parts) > 0
             if success:
                 # Extract session ID for follow-up tests
-                self.test_session_id = result.session_id
+                self.test_session_id = session_id
 
-            details = f"Success: {result.success}, Response parts: {len(result.response_parts)}"
-            if result.response_parts:
-                response_text = result.response_parts[0].text
+            details = (
+                f"Success: {result.success}, Response parts: {len(response_parts)}"
+            )
+            if response_parts:
+                response_text = response_parts[0].text
                 details += f", Response length: {len(response_text)}, Contains 'comprehension': {'comprehension' in response_text.lower()}"
 
-            if result.session_id:
-                details += f", Session ID: {result.session_id[:12]}..."
+            if session_id:
+                details += f", Session ID: {session_id[:12]}..."
 
         except Exception as e:
             success = False
@@ -83,16 +84,14 @@ class ExtendedCopilotTester:
                 message, self.test_session_id, None, None, Path(".")
             )
 
-            success = result.success and result.session_id == self.test_session_id
-            details = f"Success: {result.success}, Session resumed: {result.session_id == self.test_session_id}"
+            resumed = result.session_id == self.test_session_id
+            success = result.success and resumed
+            details = f"Success: {result.success}, Session resumed: {resumed}"
 
             if result.response_parts:
                 response_text = result.response_parts[0].text
                 # Check if response relates to list comprehensions from previous question
-                has_context = any(
-                    keyword in response_text.lower()
-                    for keyword in ["comprehension", "list", "example", "for"]
-                )
+                has_context = bool(_CONTEXT_RE.search(response_text))
                 details += f", Response length: {len(response_text)}, Has context: {has_context}"
 
         except Exception as e:
@@ -121,16 +120,23 @@ class ExtendedCopilotTester:
             details = f"Success: {result.success}, Messages: {len(result.messages)}"
 
             if success:
-                user_messages = [m for m in result.messages if m.role == "user"]
-                assistant_messages = [
-                    m for m in result.messages if m.role == "assistant"
-                ]
-
-                details += f", User msgs: {len(user_messages)}, Assistant msgs: {len(assistant_messages)}"
+                # Count roles in a single pass instead of building per-role lists
+                user_count = assistant_count = 0
+                first_user_msg = None
+                for m in result.messages:
+                    if m.role == "user":
+                        user_count += 1
+                        if first_user_msg is None:
+                            first_user_msg = m.content
+                    elif m.role == "assistant":
+                        assistant_count += 1
+
+                details += (
+                    f", User msgs: {user_count}, Assistant msgs: {assistant_count}"
+                )
 
                 # Check if our messages are in there
-                if user_messages:
-                    first_user_msg = user_messages[0].content
+                if first_user_msg is not None:
                     has_comprehension = "comprehension" in first_user_msg.lower()
                     details += f", Contains our question: {has_comprehension}"
 
@@ -160,10 +166,7 @@ class ExtendedCopilotTester:
             if result.response_parts:
                 response_text = result.response_parts[0].text
                 # Check if it mentions some files we know exist
-                mentions_files = any(
-                    filename in response_text.lower()
-                    for filename in ["test", ".py", "json", "functional"]
-                )
+                mentions_files = bool(_FILE_RE.search(response_text))
                 details += f", Response length: {len(response_text)}, Mentions files: {mentions_files}"
 
         except Exception as e:
@@ -180,13 +183,16 @@ class ExtendedCopilotTester:
         start_time = time.time()
 
         try:
-            sessions_dir = self.cli._get_sessions_directory()
+            sessions_dir = self.sessions_dir
 
             if not sessions_dir or not sessions_dir.exists():
                 success = False
                 details = "Sessions directory not found"
             else:
-                session_dirs = [d for d in sessions_dir.iterdir() if d.is_dir()]
+                # DirEntry caches the file type from the directory listing,
+                # avoiding a stat() per entry
+                with os.scandir(sessions_dir) as entries:
+                    session_dirs = [Path(e.path) for e in entries if e.is_dir()]
 
                 # Check structure of first session
                 if session_dirs:
@@ -194,11 +200,12 @@ class ExtendedCopilotTester:
                     events_file = sample_session / "events.jsonl"
                     has_events = events_file.exists()
 
-                    other_files = [
-                        f.name
-                        for f in sample_session.iterdir()
-                        if f.is_file() and f.name != "events.jsonl"
-                    ]
+                    with os.scandir(sample_session) as entries:
+                        other_files = [
+                            e.name
+                            for e in entries
+                            if e.is_file() and e.name != "events.jsonl"
+                        ]
 
                     success = True
                     details = f"Sessions: {len(session_dirs)}, Sample session: {sample_session.name}, Has events.jsonl: {has_events}, Other files: {len(other_files)}"
@@ -222,45 +229,48 @@ class ExtendedCopilotTester:
         start_time = time.time()
 
         try:
-            sessions_dir = self.cli._get_sessions_directory()
+            sessions_dir = self.sessions_dir
 
             if not sessions_dir:
                 success = False
                 details = "No sessions directory"
             else:
-                # Find a session with substantial events
+                # Find a session with substantial events; file size is a
+                # cheap stat-only proxy for the number of events
                 best_session = None
-                max_events = 0
+                max_size = 0
 
-                for session_dir in sessions_dir.iterdir():
-                    if session_dir.is_dir():
-                        events_file = session_dir / "events.jsonl"
-                        if events_file.exists():
-                            try:
-                                with open(events_file, "r") as f:
-                                    event_count = sum(1 for line in f if line.strip())
-                                if event_count > max_events:
-                                    max_events = event_count
-                                    best_session = events_file
-                            except Exception:
-                                pass
+                with os.scandir(sessions_dir) as entries:
+                    events_files = [
+                        Path(e.path) / "events.jsonl" for e in entries if e.is_dir()
+                    ]
+
+                # The stat() calls are independent I/O, so fan them out
+                with ThreadPoolExecutor(max_workers=16) as executor:
+                    sizes = list(executor.map(_file_size, events_files))
+
+                for events_file, size in zip(events_files, sizes):
+                    if size is not None and size > max_size:
+                        max_size = size
+                        best_session = events_file
 
                 if best_session:
                     # Parse the events and analyze structure
-                    messages = self.cli._parse_events_jsonl(best_session)
+                    messages = self.parse_events(best_session)
 
+                    event_count = 0
                     event_types = set()
-                    with open(best_session, "r") as f:
-                        for line in f:
-                            if line.strip():
-                                try:
-                                    event = json.loads(line)
-                                    event_types.add(event.get("type", "unknown"))
-                                except json.JSONDecodeError:
-                                    pass
+                    for line in best_session.read_bytes().splitlines():
+                        if line.strip():
+                            event_count += 1
+                            try:
+                                event = json.loads(line)
+                                event_types.add(event.get("type", "unknown"))
+                            except (json.JSONDecodeError, UnicodeDecodeError):
+                                pass
 
                     success = len(messages) > 0
-                    details = f"Best session events: {max_events}, Parsed messages: {len(messages)}, Event types: {len(event_types)}"
+                    details = f"Best session events: {event_count}, Parsed messages: {len(messages)}, Event types: {len(event_types)}"
                     if event_types:
                         details += f" ({', '.join(sorted(event_types)[:5])})"
                 else:
@@ -299,7 +309,10 @@ class ExtendedCopilotTester:
                 and matches is True
             )
 
-            details = f"Dir key type: {type(dir_key).__name__}, MS conversion: {ms_timestamp}, Session match: {matches}"
+            details = (
+                f"Dir key type: {type(dir_key).__name__}, "
+                f"MS conversion: {ms_timestamp}, Session match: {matches}"
+            )
 
         except Exception as e:
             success = False
@@ -308,35 +321,50 @@ class ExtendedCopilotTester:
         self.log_test("Helper Methods", success, details, time.time() - start_time)
         return success
 
+    def wait_for_session_saved(self, timeout: float = 2.0):
+        """Poll for the test session's events.jsonl instead of sleeping blindly"""
+        if not self.test_session_id or not self.sessions_dir:
+            return False
+
+        events_file = self.sessions_dir / self.test_session_id / "events.jsonl"
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if events_file.exists():
+                return True
+            time.sleep(0.01)
+        return False
+
     def run_extended_tests(self):
         """Run all extended functional tests"""
         print("🔬 Starting Extended GitHub Copilot CLI Tests")
         print("=" * 60)
         print()
 
-        # Test 1: Create a conversation session
-        self.test_create_conversation_session()
+        # Only create -> resume -> export share state (the session ID); the
+        # remaining tests are independent and run on worker threads.
+        independent_tests = [
+            self.test_file_operations_prompt,
+            self.test_session_directory_contents,
+            self.test_parse_real_events_structure,
+            self.test_helper_methods,
+        ]
+        with ThreadPoolExecutor(max_workers=len(independent_tests)) as executor:
+            futures = [executor.submit(test) for test in independent_tests]
 
-        # Small delay to ensure session is saved
-        time.sleep(0.5)
+            # Create a conversation session
+            self.test_create_conversation_session()
 
-        # Test 2: Resume conversation with context
-        self.test_resume_conversation_context()
+            # Wait until the session has actually been written
+            self.wait_for_session_saved()
 
-        # Test 3: Export the conversation
-        self.test_export_conversation_session()
+            # Resume conversation with context
+            self.test_resume_conversation_context()
 
-        # Test 4: File operations prompt
-        self.test_file_operations_prompt()
+            # Export the conversation
+            self.test_export_conversation_session()
 
-        # Test 5: Examine session directory
-        self.test_session_directory_contents()
-
-        # Test 6: Parse real events structure
-        self.test_parse_real_events_structure()
-
-        # Test 7: Helper methods
-        self.test_helper_methods()
+            for future in futures:
+                future.result()
 
         # Summary
         self.print_summary()
@@ -348,7 +376,7 @@ class ExtendedCopilotTester:
         print("=" * 60)
 
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for r in self.test_results if r["success"])
+        passed_tests = self._passed
         failed_tests = total_tests - passed_tests
 
         print(f"Total Tests: {total_tests}")
@@ -356,8 +384,7 @@ class ExtendedCopilotTester:
         print(f"❌ Failed: {failed_tests}")
         print(f"Success Rate: {(passed_tests / total_tests) * 100:.1f}%")
 
-        total_time = sum(r["duration_ms"] for r in self.test_results)
-        print(f"Total Time: {total_time:.1f}ms")
+        print(f"Total Time: {self._total_time_ms:.1f}ms")
 
         # Show failed tests
         if failed_tests > 0:
@@ -375,17 +402,15 @@ if __name__ == "__main__":
 
     # Save detailed results
     results_file = Path(__file__).parent / "extended_test_results.json"
-    with open(results_file, "w") as f:
-        json.dump(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "copilot_version": "0.0.395",
-                "all_passed": all_passed,
-                "results": tester.test_results,
-            },
-            f,
-            indent=2,
-        )
+    save_results(
+        results_file,
+        {
+            "timestamp": datetime.now(),
+            "copilot_version": "0.0.395",
+            "all_passed": all_passed,
+            "results": tester.test_results,
+        },
+    )
 
     print(f"\n📄 Extended results saved to: {results_file}")
 
@@ -4,38 +4,30 @@ Real-world functional tests for CopilotAgentCLI
 Tests all public methods against actual GitHub Copilot CLI
 """
 
+import heapq
+import os
 import sys
-import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-# Add the backend to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "packages/pybackend"))
+from functional_test_helpers import FunctionalTester, save_results
 
-from copilot_agent_cli import CopilotAgentCLI
 
-
-class CopilotFunctionalTester:
+class CopilotFunctionalTester(FunctionalTester):
     def __init__(self):
-        self.cli = CopilotAgentCLI()
-        self.test_results = []
+        super().__init__()
         self.test_session_ids = []
+        self._slowest = []  # min-heap of the 3 slowest (duration_ms, test)
 
-    def log_test(self, test_name: str, success: bool, details: str, duration: float):
-        """Log test results"""
-        result = {
-            "test": test_name,
-            "success": success,
-            "details": details,
-            "duration_ms": round(duration * 1000, 2),
-            "timestamp": datetime.now().isoformat(),
-        }
-        self.test_results.append(result)
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name} ({duration * 1000:.1f}ms)")
-        print(f"   Details: {details}")
-        print()
+    def record_result(self, result: dict) -> None:
+        """Track the slowest tests for the performance summary"""
+        entry = (result["duration_ms"], result["test"])
+        if len(self._slowest) < 3:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
 
     def test_cli_properties(self):
         """Test basic CLI properties"""
@@ -46,7 +38,10 @@ class CopilotFunctionalTester:
             error_msg = self.cli.missing_command_error()
 
             success = cli_name == "copilot" and "copilot" in error_msg
-            details = f"CLI name: '{cli_name}', Error msg contains 'copilot': {'copilot' in error_msg}"
+            details = (
+                f"CLI name: '{cli_name}', "
+                f"Error msg contains 'copilot': {'copilot' in error_msg}"
+            )
 
         except Exception as e:
             success = False
@@ -65,11 +60,14 @@ class CopilotFunctionalTester:
             message = "What is Python? Give a one sentence answer."
             result = self.cli.run_agent(message, None, None, None, Path("."))
 
-            success = result.success and len(result.response_parts) > 0
-            if success and result.session_id:
-                self.test_session_ids.append(result.session_id)
+            response_count = len(result.response_parts)
+            new_session_id = result.session_id
+
+            success = result.success and response_count > 0
+            if success and new_session_id:
+                self.test_session_ids.append(new_session_id)
 
-            details = f"Success: {result.success}, Response parts: {len(result.response_parts)}, Session ID: {result.session_id[:8] if result.session_id else 'None'}"
+            details = f"Success: {result.success}, Response parts: {response_count}, Session ID: {new_session_id[:8] if new_session_id else 'None'}"
             if result.error_message:
                 details += f", Error: {result.error_message[:100]}"
 
@@ -91,8 +89,9 @@ class CopilotFunctionalTester:
             message = "What programming language did you just mention?"
             result = self.cli.run_agent(message, session_id, None, None, Path("."))
 
-            success = result.success and result.session_id == session_id
-            details = f"Success: {result.success}, Session resumed: {result.session_id == session_id}, Response parts: {len(result.response_parts)}"
+            resumed = result.session_id == session_id
+            success = result.success and resumed
+            details = f"Success: {result.success}, Session resumed: {resumed}, Response parts: {len(result.response_parts)}"
             if result.error_message:
                 details += f", Error: {result.error_message[:100]}"
 
@@ -145,11 +144,13 @@ class CopilotFunctionalTester:
             details = f"Success: {result.success}, Messages: {len(result.messages)}"
 
             if success:
-                # Check message structure
-                user_msgs = sum(1 for m in result.messages if m.role == "user")
-                assistant_msgs = sum(
-                    1 for m in result.messages if m.role == "assistant"
-                )
+                # Check message structure in a single pass over the messages
+                user_msgs = assistant_msgs = 0
+                for m in result.messages:
+                    if m.role == "user":
+                        user_msgs += 1
+                    elif m.role == "assistant":
+                        assistant_msgs += 1
                 details += f", User msgs: {user_msgs}, Assistant msgs: {assistant_msgs}"
 
             if result.error_message:
@@ -194,7 +195,7 @@ class CopilotFunctionalTester:
 
         try:
             # Call the private method to test session directory detection
-            sessions_dir = self.cli._get_sessions_directory()
+            sessions_dir = self.sessions_dir
 
             success = sessions_dir is not None and sessions_dir.exists()
             details = (
@@ -203,8 +204,11 @@ class CopilotFunctionalTester:
 
             if success:
                 # Count actual session directories
-                session_dirs = [d for d in sessions_dir.iterdir() if d.is_dir()]
-                details += f", Session directories: {len(session_dirs)}"
+                # DirEntry caches the file type from the directory listing,
+                # avoiding a stat() per entry
+                with os.scandir(sessions_dir) as entries:
+                    session_count = sum(1 for e in entries if e.is_dir())
+                details += f", Session directories: {session_count}"
 
         except Exception as e:
             success = False
@@ -220,25 +224,23 @@ class CopilotFunctionalTester:
         start_time = time.time()
 
         try:
-            sessions_dir = self.cli._get_sessions_directory()
+            sessions_dir = self.sessions_dir
             if not sessions_dir or not sessions_dir.exists():
                 success = False
                 details = "No sessions directory found"
             else:
-                # Find a session with events.jsonl
-                events_files_found = 0
-                parsed_events = 0
-
-                for session_dir in sessions_dir.iterdir():
-                    if session_dir.is_dir():
-                        events_file = session_dir / "events.jsonl"
-                        if events_file.exists():
-                            events_files_found += 1
-                            try:
-                                messages = self.cli._parse_events_jsonl(events_file)
-                                parsed_events += len(messages)
-                            except Exception:
-                                pass
+                with os.scandir(sessions_dir) as entries:
+                    events_files = [
+                        Path(e.path) / "events.jsonl" for e in entries if e.is_dir()
+                    ]
+
+                # Each session's events.jsonl is parsed independently, so
+                # spread the file reads over a thread pool
+                with ThreadPoolExecutor(max_workers=16) as executor:
+                    counts = list(executor.map(self._count_parsed_events, events_files))
+
+                events_files_found = sum(1 for c in counts if c is not None)
+                parsed_events = sum(c for c in counts if c is not None)
 
                 success = events_files_found > 0
                 details = f"Events files found: {events_files_found}, Total events parsed: {parsed_events}"
@@ -252,6 +254,15 @@ class CopilotFunctionalTester:
         )
         return success
 
+    def _count_parsed_events(self, events_file: Path) -> int | None:
+        """Parse an events.jsonl file, returning None if it doesn't exist"""
+        if not events_file.exists():
+            return None
+        try:
+            return len(self.parse_events(events_file))
+        except Exception:
+            return 0
+
     def test_error_handling(self):
         """Test error handling with invalid inputs"""
         start_time = time.time()
@@ -280,36 +291,37 @@ class CopilotFunctionalTester:
         print("=" * 60)
         print()
 
-        # Test 1: Basic CLI properties
-        self.test_cli_properties()
-
-        # Test 2: Session directory detection
-        self.test_session_directory_detection()
-
-        # Test 3: Run agent with simple prompt
-        success, session_id = self.test_run_agent_simple()
-
-        # Test 4: Resume session (if we created one)
-        if success and session_id:
-            self.test_run_agent_with_session(session_id)
-
-        # Test 5: List sessions
-        success, sessions = self.test_list_sessions()
-
-        # Test 6: Export session (use first available session)
-        if sessions:
-            self.test_export_session(sessions[0].session_id)
-        elif session_id:
-            self.test_export_session(session_id)
-
-        # Test 7: List agents
-        self.test_list_agents()
-
-        # Test 8: Events JSONL parsing
-        self.test_events_jsonl_parsing()
-
-        # Test 9: Error handling
-        self.test_error_handling()
+        # Tests that don't depend on a session created by this run are
+        # independent, so run them on worker threads while the
+        # create -> resume -> list -> export chain runs here.
+        independent_tests = [
+            self.test_cli_properties,
+            self.test_session_directory_detection,
+            self.test_list_agents,
+            self.test_events_jsonl_parsing,
+            self.test_error_handling,
+        ]
+        with ThreadPoolExecutor(max_workers=len(independent_tests)) as executor:
+            futures = [executor.submit(test) for test in independent_tests]
+
+            # Run agent with simple prompt
+            success, session_id = self.test_run_agent_simple()
+
+            # Resume session (if we created one)
+            if success and session_id:
+                self.test_run_agent_with_session(session_id)
+
+            # List sessions
+            success, sessions = self.test_list_sessions()
+
+            # Export session (use first available session)
+            if sessions:
+                self.test_export_session(sessions[0].session_id)
+            elif session_id:
+                self.test_export_session(session_id)
+
+            for future in futures:
+                future.result()
 
         # Summary
         self.print_summary()
@@ -321,7 +333,7 @@ class CopilotFunctionalTester:
         print("=" * 60)
 
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for r in self.test_results if r["success"])
+        passed_tests = self._passed
         failed_tests = total_tests - passed_tests
 
         print(f"Total Tests: {total_tests}")
@@ -329,8 +341,7 @@ class CopilotFunctionalTester:
         print(f"❌ Failed: {failed_tests}")
         print(f"Success Rate: {(passed_tests / total_tests) * 100:.1f}%")
 
-        total_time = sum(r["duration_ms"] for r in self.test_results)
-        print(f"Total Time: {total_time:.1f}ms")
+        print(f"Total Time: {self._total_time_ms:.1f}ms")
 
         # Show failed tests
         if failed_tests > 0:
@@ -341,11 +352,8 @@ class CopilotFunctionalTester:
 
         # Show performance info
         print("\n⚡ PERFORMANCE:")
-        sorted_tests = sorted(
-            self.test_results, key=lambda x: x["duration_ms"], reverse=True
-        )
-        for result in sorted_tests[:3]:  # Top 3 slowest
-            print(f"   {result['test']}: {result['duration_ms']:.1f}ms")
+        for duration_ms, test_name in sorted(self._slowest, reverse=True):
+            print(f"   {test_name}: {duration_ms:.1f}ms")
 
         return passed_tests == total_tests
 
@@ -356,17 +364,15 @@ if __name__ == "__main__":
 
     # Save detailed results
     results_file = Path(__file__).parent / "functional_test_results.json"
-    with open(results_file, "w") as f:
-        json.dump(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "copilot_version": "0.0.395",  # From earlier check
-                "all_passed": all_passed,
-                "results": tester.test_results,
-            },
-            f,
-            indent=2,
-        )
+    save_results(
+        results_file,
+        {
+            "timestamp": datetime.now(),
+            "copilot_version": "0.0.395",  # From earlier check
+            "all_passed": all_passed,
+            "results": tester.test_results,
+        },
+    )
 
     print(f"\n📄 Detailed results saved to: {results_file}")
 
@@ -4,8 +4,11 @@ Comprehensive helper methods test for CopilotAgentCLI
 Tests all utility methods and edge cases
 """
 
+import os
 import sys
 import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -14,6 +17,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "packages/pybackend
 
 from copilot_agent_cli import CopilotAgentCLI
 
+# Shared working directory argument, built once instead of per call
+CWD = Path(".")
+
 
 def test_all_helper_methods():
     """Test all helper methods comprehensively"""
@@ -40,13 +46,14 @@ def test_all_helper_methods():
         print(f"   Path: {sessions_dir}")
         print(f"   Exists: {sessions_dir.exists()}")
         if sessions_dir.exists():
-            session_count = len([d for d in sessions_dir.iterdir() if d.is_dir()])
+            with os.scandir(sessions_dir) as entries:
+                session_count = sum(1 for e in entries if e.is_dir())
             print(f"   Session directories: {session_count}")
     print(f"   ✅ Sessions directory: {sessions_dir is not None}")
 
     # Test 3: Directory key generation
     print("\n3. Testing directory key generation...")
-    test_paths = [Path("/tmp/test"), Path("/home/user/project"), Path("."), Path("/")]
+    test_paths = [Path("/tmp/test"), Path("/home/user/project"), CWD, Path("/")]
 
     for path in test_paths:
         dir_key = cli._get_directory_key(path)
@@ -81,16 +88,17 @@ def test_all_helper_methods():
     # Test 5: Session matching with real sessions
     print("\n5. Testing session matching...")
     if sessions_dir and sessions_dir.exists():
-        session_dirs = [d for d in sessions_dir.iterdir() if d.is_dir()]
-        if session_dirs:
+        with os.scandir(sessions_dir) as entries:
+            session_ids = [e.name for e in entries if e.is_dir()]
+        if session_ids:
             # Test with real session ID
-            real_session_id = session_dirs[0].name
-            matches = cli._session_matches_directory(real_session_id, Path("."))
-            print(f"   Real session {real_session_id[:8]}... matches: {matches}")
+            real_session_id = session_ids[0]
+            matches = cli._session_matches_directory(real_session_id, CWD)
+            print(f"   Real session {real_session_id:.8}... matches: {matches}")
 
             # Test with fake session ID
             fake_session_id = "fake-session-id-12345"
-            matches_fake = cli._session_matches_directory(fake_session_id, Path("."))
+            matches_fake = cli._session_matches_directory(fake_session_id, CWD)
             print(f"   Fake session matches: {matches_fake}")
 
             print(f"   ✅ Session matching: {matches and not matches_fake}")
@@ -142,12 +150,12 @@ def test_error_scenarios():
 
     # Test 1: Export non-existent session
     print("1. Testing export of non-existent session...")
-    result = cli.export_session("non-existent-session-12345", Path("."))
+    result = cli.export_session("non-existent-session-12345", CWD)
 
     print(f"   Success (should be False): {result.success}")
     print(f"   Has error message: {result.error_message is not None}")
     if result.error_message:
-        print(f"   Error: {result.error_message[:100]}")
+        print(f"   Error: {result.error_message:.100}")
     print(
         f"   ✅ Non-existent session handled: {not result.success and result.error_message}"
     )
@@ -159,11 +167,11 @@ def test_error_scenarios():
     cli._get_sessions_directory = lambda: None
 
     try:
-        sessions_result = cli.list_sessions(Path("."))
+        sessions_result = cli.list_sessions(CWD)
         print(f"   List sessions success: {sessions_result.success}")
         print(f"   Sessions count: {len(sessions_result.sessions)}")
 
-        export_result = cli.export_session("any-session", Path("."))
+        export_result = cli.export_session("any-session", CWD)
         print(f"   Export success: {export_result.success}")
         print(f"   Has error: {export_result.error_message is not None}")
 
@@ -183,31 +191,56 @@ def performance_benchmark():
     print("\n⚡ Performance Benchmark")
     print("=" * 50)
 
+    # Serial timings let timeit pick an iteration count that runs for at least
+    # 0.2s, so fast calls aren't lost in clock granularity
+    def per_call_us(func):
+        count, elapsed = timeit.Timer(func).autorange()
+        return count, elapsed / count * 1e6
+
     # Benchmark list_sessions
-    start_time = time.time()
-    for _ in range(10):
-        cli.list_sessions(Path("."))
-    list_sessions_time = (time.time() - start_time) * 100  # ms per call
+    count, list_sessions_us = per_call_us(lambda: cli.list_sessions(CWD))
+
+    print(f"List sessions: {list_sessions_us:.1f}µs per call (avg of {count})")
 
-    print(f"List sessions: {list_sessions_time:.2f}ms per call (avg of 10)")
+    # Benchmark list_sessions under concurrent load; the work is mostly
+    # filesystem I/O, so poor scaling here points at shared-state contention
+    start_ns = time.perf_counter_ns()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: cli.list_sessions(CWD), range(40)))
+    # Nanoseconds stay integers; they only become µs when formatted
+    concurrent_list_ns = (time.perf_counter_ns() - start_ns) // 40
+
+    print(
+        f"List sessions (4 threads): {concurrent_list_ns / 1000:.1f}µs per call "
+        "(avg of 40)"
+    )
 
     # Benchmark session directory access
-    start_time = time.time()
-    for _ in range(100):
-        cli._get_sessions_directory()
-    dir_access_time = (time.time() - start_time) * 10  # ms per call
+    count, dir_access_us = per_call_us(cli._get_sessions_directory)
 
-    print(f"Session directory access: {dir_access_time:.2f}ms per call (avg of 100)")
+    print(f"Session directory access: {dir_access_us:.2f}µs per call (avg of {count})")
 
     # Benchmark text cleaning
     test_text = "Some \x1b[31mtext\x1b[0m with ANSI codes and prefixes"
-    start_time = time.time()
-    for _ in range(1000):
+
+    def clean_test_text():
         cli._strip_ansi_codes(test_text)
         cli._clean_response_text(test_text)
-    text_cleaning_time = time.time() - start_time  # ms per call
 
-    print(f"Text cleaning: {text_cleaning_time:.2f}ms per 1000 calls")
+    count, text_cleaning_us = per_call_us(clean_test_text)
+
+    print(f"Text cleaning: {text_cleaning_us:.2f}µs per call (avg of {count})")
+
+    # Benchmark text cleaning without ANSI codes (fast path)
+    plain_text = "Some plain text without any escape codes"
+
+    def clean_plain_text():
+        cli._strip_ansi_codes(plain_text)
+        cli._clean_response_text(plain_text)
+
+    count, plain_cleaning_us = per_call_us(clean_plain_text)
+
+    print(f"Plain text cleaning: {plain_cleaning_us:.2f}µs per call (avg of {count})")
 
     return True
 
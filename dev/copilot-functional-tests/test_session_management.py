@@ -4,10 +4,13 @@ Session management test for CopilotAgentCLI
 Tests session creation, discovery, and resumption patterns
 """
 
+import os
+import re
 import sys
 import json
 import time
 import subprocess
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 
@@ -16,6 +19,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "packages/pybackend
 
 from copilot_agent_cli import CopilotAgentCLI
 
+# Shared working directory argument, built once instead of per call
+CWD = Path(".")
+
+# Case-insensitive keyword alternation, searched in one pass over a response
+_CONTEXT_RE = re.compile(r"test|session|remember|yes|confirmed", re.IGNORECASE)
+
+# Copilot writes "type" as the first key of every event, so it can be read
+# without parsing the rest of the object
+_EVENT_TYPE_RE = re.compile(rb'^\s*\{\s*"type"\s*:\s*"([^"\\]+)"')
+
 
 def test_session_workflow():
     """Test complete session workflow"""
@@ -26,7 +39,7 @@ def test_session_workflow():
 
     # Step 1: Get sessions before our test
     print("1. Getting existing sessions...")
-    before_result = cli.list_sessions(Path("."))
+    before_result = cli.list_sessions(CWD)
     before_count = len(before_result.sessions) if before_result.success else 0
     print(f"   Found {before_count} existing sessions")
 
@@ -37,7 +50,7 @@ def test_session_workflow():
     )
 
     start_time = time.time()
-    result = cli.run_agent(message, None, None, None, Path("."))
+    result = cli.run_agent(message, None, None, None, CWD)
     duration = time.time() - start_time
 
     print(f"   Duration: {duration * 1000:.1f}ms")
@@ -46,13 +59,13 @@ def test_session_workflow():
 
     if result.response_parts:
         response_text = result.response_parts[0].text
-        print(f"   Response preview: {response_text[:100]}...")
+        print(f"   Response preview: {response_text:.100}...")
 
     # Step 3: Wait and check for new session
     print("\n3. Waiting for session to be saved...")
     time.sleep(2)  # Give copilot time to save the session
 
-    after_result = cli.list_sessions(Path("."))
+    after_result = cli.list_sessions(CWD)
     after_count = len(after_result.sessions) if after_result.success else 0
     print(f"   Found {after_count} sessions (was {before_count})")
 
@@ -69,16 +82,15 @@ def test_session_workflow():
     # Step 5: Test session export
     if newest_session:
         print(f"\n4. Exporting newest session...")
-        export_result = cli.export_session(newest_session.session_id, Path("."))
+        export_result = cli.export_session(newest_session.session_id, CWD)
 
         print(f"   Export success: {export_result.success}")
         if export_result.success:
             print(f"   Messages exported: {len(export_result.messages)}")
             for i, msg in enumerate(export_result.messages):
-                preview = (
-                    msg.content[:50] + "..." if len(msg.content) > 50 else msg.content
-                )
-                print(f"   Message {i + 1} ({msg.role}): {preview}")
+                # The .50 format spec truncates while formatting, no slice copy
+                ellipsis = "..." if len(msg.content) > 50 else ""
+                print(f"   Message {i + 1} ({msg.role}): {msg.content:.50}{ellipsis}")
 
     # Step 6: Test session resumption
     if newest_session:
@@ -88,7 +100,7 @@ def test_session_workflow():
         )
 
         resume_result = cli.run_agent(
-            resume_message, newest_session.session_id, None, None, Path(".")
+            resume_message, newest_session.session_id, None, None, CWD
         )
 
         print(f"   Resume success: {resume_result.success}")
@@ -98,13 +110,10 @@ def test_session_workflow():
 
         if resume_result.response_parts:
             resume_response = resume_result.response_parts[0].text
-            print(f"   Resume response preview: {resume_response[:100]}...")
+            print(f"   Resume response preview: {resume_response:.100}...")
 
             # Check if it shows context awareness
-            context_keywords = ["test", "session", "remember", "yes", "confirmed"]
-            has_context = any(
-                keyword in resume_response.lower() for keyword in context_keywords
-            )
+            has_context = bool(_CONTEXT_RE.search(resume_response))
             print(f"   Shows context awareness: {has_context}")
 
     return True
@@ -115,24 +124,47 @@ def test_real_copilot_commands():
     print("\n🔧 Testing Direct Copilot CLI Commands")
     print("=" * 50)
 
+    # copilot has no persistent stdin mode, so every command pays process
+    # startup. Launch the version and help checks together so their startup
+    # overlaps instead of running back to back.
+    def start(*args):
+        try:
+            return subprocess.Popen(
+                ["copilot", *args],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except Exception as e:
+            return e
+
+    version_proc = start("--version")
+    help_proc = start("--help")
+
     # Test 1: Version check
     try:
-        result = subprocess.run(
-            ["copilot", "--version"], capture_output=True, text=True, timeout=5
-        )
-        print(f"1. Version: {result.stdout.strip()}")
-        print(f"   Success: {result.returncode == 0}")
+        if isinstance(version_proc, Exception):
+            raise version_proc
+        stdout, _ = version_proc.communicate(timeout=5)
+        print(f"1. Version: {stdout.strip()}")
+        print(f"   Success: {version_proc.returncode == 0}")
+    except subprocess.TimeoutExpired as e:
+        version_proc.kill()
+        print(f"1. Version check failed: {e}")
     except Exception as e:
         print(f"1. Version check failed: {e}")
 
     # Test 2: Help command
     try:
-        result = subprocess.run(
-            ["copilot", "--help"], capture_output=True, text=True, timeout=5
-        )
-        print(f"2. Help command: {len(result.stdout)} chars")
-        print(f"   Success: {result.returncode == 0}")
-        print(f"   Contains '-p': {'-p' in result.stdout}")
+        if isinstance(help_proc, Exception):
+            raise help_proc
+        stdout, _ = help_proc.communicate(timeout=5)
+        print(f"2. Help command: {len(stdout)} chars")
+        print(f"   Success: {help_proc.returncode == 0}")
+        print(f"   Contains '-p': {'-p' in stdout}")
+    except subprocess.TimeoutExpired as e:
+        help_proc.kill()
+        print(f"2. Help command failed: {e}")
     except Exception as e:
         print(f"2. Help command failed: {e}")
 
@@ -159,7 +191,7 @@ def test_real_copilot_commands():
         print(f"   Stderr: {len(result.stderr)} chars")
 
         if result.stdout:
-            print(f"   Response preview: {result.stdout[:100]}...")
+            print(f"   Response preview: {result.stdout:.100}...")
 
     except Exception as e:
         print(f"3. Simple prompt failed: {e}")
@@ -182,61 +214,81 @@ def inspect_session_structure():
 
     print(f"Sessions directory: {sessions_dir}")
 
-    session_dirs = [d for d in sessions_dir.iterdir() if d.is_dir()]
+    # DirEntry caches the file type from the directory listing, so this
+    # avoids a stat() per entry
+    with os.scandir(sessions_dir) as entries:
+        session_dirs = [e for e in entries if e.is_dir()]
     print(f"Total sessions: {len(session_dirs)}")
 
     # Examine first few sessions
     for i, session_dir in enumerate(session_dirs[:3]):
         print(f"\nSession {i + 1}: {session_dir.name}")
 
-        # List files
-        files = list(session_dir.iterdir())
-        print(f"   Files: {[f.name for f in files]}")
-
-        # Check events.jsonl
-        events_file = session_dir / "events.jsonl"
-        if events_file.exists():
-            try:
-                with open(events_file, "r") as f:
-                    lines = f.readlines()
-                print(f"   Events: {len(lines)} lines")
-
-                # Show event types
-                event_types = set()
-                for line in lines:
-                    try:
-                        event = json.loads(line.strip())
-                        event_types.add(event.get("type", "unknown"))
-                    except:
-                        pass
-
-                print(f"   Event types: {sorted(event_types)}")
-
-                # Parse with our CLI
-                messages = cli._parse_events_jsonl(events_file)
-                print(f"   Parsed messages: {len(messages)}")
-
-            except Exception as e:
-                print(f"   Events parsing error: {e}")
-
-        # Check workspace.yaml
-        workspace_file = session_dir / "workspace.yaml"
-        if workspace_file.exists():
-            try:
-                with open(workspace_file, "r") as f:
-                    content = f.read()
-                print(f"   Workspace: {len(content)} chars")
-            except Exception as e:
-                print(f"   Workspace reading error: {e}")
+        # Open the session directory once; the listing and the workspace read
+        # below resolve names relative to it instead of walking the full path
+        dir_fd = os.open(session_dir.path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        try:
+            inspect_session_files(cli, Path(session_dir.path), dir_fd)
+        finally:
+            os.close(dir_fd)
 
     return True
 
 
+def inspect_session_files(cli, session_path, dir_fd):
+    """Report on the files of one session directory opened as dir_fd"""
+    # List files; the names double as the existence checks below
+    with os.scandir(dir_fd) as entries:
+        file_names = [e.name for e in entries]
+    print(f"   Files: {file_names}")
+
+    # Check events.jsonl
+    events_file = session_path / "events.jsonl"
+    if "events.jsonl" in file_names:
+        try:
+            # Split lines the same way the CLI does
+            line_count = 0
+            event_types = Counter()
+            for line in cli._read_event_lines(events_file):
+                line_count += 1
+                match = _EVENT_TYPE_RE.match(line)
+                if match:
+                    event_types[match.group(1).decode()] += 1
+                    continue
+                # Fall back to a full parse when "type" isn't the leading key
+                try:
+                    event = json.loads(line)
+                    event_types[event.get("type", "unknown")] += 1
+                except:
+                    pass
+
+            print(f"   Events: {line_count} lines")
+            print(f"   Event types: {dict(sorted(event_types.items()))}")
+
+            # Parse with our CLI
+            messages = cli._parse_events_jsonl(events_file)
+            print(f"   Parsed messages: {len(messages)}")
+
+        except Exception as e:
+            print(f"   Events parsing error: {e}")
+
+    # Check workspace.yaml
+    if "workspace.yaml" in file_names:
+        try:
+            fd = os.open("workspace.yaml", os.O_RDONLY, dir_fd=dir_fd)
+            with os.fdopen(fd, "r") as f:
+                content = f.read()
+            print(f"   Workspace: {len(content)} chars")
+        except Exception as e:
+            print(f"   Workspace reading error: {e}")
+
+
 if __name__ == "__main__":
     print("🧪 CopilotAgentCLI Session Management Tests")
     print("=" * 60)
 
-    # Run all tests
+    # Run all tests sequentially: `copilot -p` creates sessions, which would
+    # skew the workflow test's before/after counts and newest-session pick
     test_session_workflow()
     test_real_copilot_commands()
     inspect_session_structure()
@@ -19,10 +19,40 @@ from agent_results import (
 
 logger = logging.getLogger(__name__)
 
-SESSION_ROW_PATTERN = re.compile(r"^(ses_[^\s]+)\s{2,}(.*?)\s{2,}(.+)$")
+SESSION_ROW_PATTERN = re.compile(r"^\s*(ses_\S+)\s{2,}(.*?)\s{2,}(.+?)\s*$")
 AGENT_ROW_PATTERN = re.compile(r"^(?P<name>\S+)\s+\((?P<kind>[^)]+)\)\s*$")
 
 
+def to_milliseconds(raw_value: object) -> int | None:
+    """Convert value to milliseconds timestamp."""
+    # Exported timestamps are almost always ints or missing; both are settled
+    # without the float round trip or a raised TypeError
+    if type(raw_value) is int:
+        return raw_value
+    if raw_value is None:
+        return None
+    try:
+        return int(float(raw_value))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+# Keys checked in priority order when resolving message and part timestamps
+MESSAGE_TIME_KEYS = ("created", "start", "completed", "end", "updated")
+PART_TIME_KEYS = ("end", "start")
+
+
+def first_milliseconds(
+    time_info: dict[str, object], keys: tuple[str, ...]
+) -> int | None:
+    """Return the first of keys in time_info that converts to milliseconds."""
+    for key in keys:
+        resolved = to_milliseconds(time_info.get(key))
+        if resolved is not None:
+            return resolved
+    return None
+
+
 class AgentCLI(ABC):
     @classmethod
     @abstractmethod
@@ -59,7 +89,7 @@ class AgentCLI(ABC):
         model: str | None,
         cwd: Path,
         cancel_event: Event | None = None,
-        on_process: Callable[[subprocess.Popen[str]], None] | None = None,
+        on_process: Callable[[subprocess.Popen], None] | None = None,
     ) -> RunResult:
         """Run agent with message and return structured result."""
         raise NotImplementedError
@@ -81,10 +111,7 @@ class AgentCLI(ABC):
 
     def _to_milliseconds(self, raw_value: object) -> int | None:
         """Convert value to milliseconds timestamp."""
-        try:
-            return int(float(raw_value))
-        except (TypeError, ValueError):
-            return None
+        return to_milliseconds(raw_value)
 
     def _extract_part_content(self, part: dict[str, object], part_type: str) -> str:
         """Extract content from a response part."""
@@ -125,13 +152,17 @@ class AgentCLI(ABC):
     ) -> tuple[str | None, list[ResponsePart]]:
         """Parse opencode JSON output into structured response parts."""
         session_id = None
-        parts: list[dict[str, object]] = []
+        response_parts: list[ResponsePart] = []
+        last_text_index = -1
 
         for line in stdout.splitlines():
-            if not line.strip():
+            # Every event is a JSON object; banner and log lines are skipped
+            # without raising a decode error
+            stripped = line.lstrip()
+            if not stripped.startswith("{"):
                 continue
             try:
-                payload = json.loads(line)
+                payload = json.loads(stripped)
             except json.JSONDecodeError:
                 continue
 
@@ -140,82 +171,37 @@ class AgentCLI(ABC):
                 session_id = payload_session_id
 
             payload_type = payload.get("type")
-            payload_timestamp = payload.get("timestamp")
             part = payload.get("part") or {}
 
-            part_id = part.get("id")
-            call_id = part.get("callID") or part.get("callId")
-
             if payload_type == "text":
-                text = self._extract_part_content(part, "text")
                 # Include all text parts, even empty ones, to maintain conversation flow
-                parts.append(
-                    {
-                        "kind": "text",
-                        "content": text,
-                        "timestamp": payload_timestamp,
-                        "part_id": part_id,
-                        "call_id": call_id,
-                    }
-                )
+                last_text_index = len(response_parts)
+                part_type = "thinking"
+                content = self._extract_part_content(part, "text")
             elif payload_type == "reasoning":
-                reasoning_text = self._extract_part_content(part, "reasoning")
                 # Reasoning content should be treated as thinking
-                parts.append(
-                    {
-                        "kind": "reasoning",
-                        "content": reasoning_text,
-                        "timestamp": payload_timestamp,
-                        "part_id": part_id,
-                        "call_id": call_id,
-                    }
-                )
-            elif payload_type in {"tool_use", "tool"}:
-                tool_name = self._extract_part_content(part, payload_type)
-                if tool_name:  # Only include tools if they have content
-                    parts.append(
-                        {
-                            "kind": "tool",
-                            "content": tool_name,
-                            "timestamp": payload_timestamp,
-                            "part_id": part_id,
-                            "call_id": call_id,
-                        }
-                    )
-
-        if not parts:
-            return session_id, []
-
-        response_parts: list[ResponsePart] = []
-        text_indices = [
-            index for index, part in enumerate(parts) if part.get("kind") == "text"
-        ]
-
-        for index, part in enumerate(parts):
-            kind = part.get("kind")
-            content = str(part.get("content", ""))
-            raw_timestamp = part.get("timestamp")
-            timestamp = self._to_milliseconds(raw_timestamp)
-
-            if kind == "text":
-                part_type = (
-                    "final"
-                    if text_indices and index == text_indices[-1]
-                    else "thinking"
-                )
-            elif kind == "reasoning":
                 part_type = "thinking"
-            else:
+                content = self._extract_part_content(part, "reasoning")
+            elif payload_type in {"tool_use", "tool"}:
                 part_type = "tool"
+                content = self._extract_part_content(part, payload_type)
+                if not content:  # Only include tools if they have content
+                    continue
+            else:
+                continue
 
             response_parts.append(
                 ResponsePart(
-                    text=content,
-                    timestamp=timestamp,
+                    text=str(content),
+                    timestamp=self._to_milliseconds(payload.get("timestamp")),
                     part_type=part_type,
-                    part_id=part.get("part_id"),
-                    call_id=part.get("call_id"),
+                    part_id=part.get("id"),
+                    call_id=part.get("callID") or part.get("callId"),
                 )
             )
 
+        # Only the last text part is the final answer; earlier ones are thinking
+        if last_text_index >= 0:
+            response_parts[last_text_index].part_type = "final"
+
         return session_id, response_parts
@@ -2,12 +2,32 @@
 
 from __future__ import annotations
 
+import functools
+import time
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from typing import Literal
 
 
-@dataclass
+def format_epoch_milliseconds_uncached(millis: float) -> str:
+    """Format epoch milliseconds as an ISO 8601 UTC string with a Z suffix."""
+    # Plain time.gmtime() arithmetic avoids building datetime/tzinfo objects
+    # and the "+00:00" -> "Z" replace for every entry
+    seconds, micros = divmod(round(millis * 1000), 1_000_000)
+    t = time.gmtime(seconds)
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T"
+        f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{micros // 1000:03d}Z"
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def format_epoch_milliseconds(millis: float) -> str:
+    """Memoized format_epoch_milliseconds_uncached for repeated timestamps."""
+    # Parts of one message often share a timestamp
+    return format_epoch_milliseconds_uncached(millis)
+
+
+@dataclass(slots=True)
 class ResponsePart:
     """Individual response part from agent."""
 
@@ -24,10 +44,7 @@ class ResponsePart:
             "type": self.part_type,
         }
         if self.timestamp is not None:
-            dt = datetime.fromtimestamp(self.timestamp / 1000, tz=UTC)
-            result["timestamp"] = dt.isoformat(timespec="milliseconds").replace(
-                "+00:00", "Z"
-            )
+            result["timestamp"] = format_epoch_milliseconds(self.timestamp)
         if self.part_id:
             result["partId"] = self.part_id
         if self.call_id:
@@ -52,7 +69,7 @@ class RunResult:
         return "\n\n".join(part.text for part in self.response_parts if part.text)
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoryMessage:
     """Individual message in chat history."""
 
@@ -74,10 +91,7 @@ class HistoryMessage:
         if self.message_id:
             result["messageId"] = self.message_id
         if self.timestamp is not None:
-            dt = datetime.fromtimestamp(self.timestamp / 1000, tz=UTC)
-            result["timestamp"] = dt.isoformat(timespec="milliseconds").replace(
-                "+00:00", "Z"
-            )
+            result["timestamp"] = format_epoch_milliseconds(self.timestamp)
         else:
             result["timestamp"] = None
         if self.part_id:
@@ -97,7 +111,7 @@ class ExportResult:
     error_message: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionInfo:
     """Information about a chat session."""
 
@@ -123,7 +137,7 @@ class SessionListResult:
     error_message: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentInfo:
     """Information about an available agent."""
 
@@ -9,7 +9,17 @@ from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from threading import Event, Lock
 
-from agent_cli import AgentCLI
+from agent_cli import (
+    MESSAGE_TIME_KEYS,
+    PART_TIME_KEYS,
+    AgentCLI,
+    first_milliseconds,
+    to_milliseconds,
+)
+from agent_results import (
+    format_epoch_milliseconds,
+    format_epoch_milliseconds_uncached,
+)
 from opencode_legacy_agent_cli import OpenCodeAgentCLI
 from opencode_database_agent_cli import OpenCodeDatabaseAgentCLI
 from copilot_agent_cli import CopilotAgentCLI
@@ -28,7 +38,7 @@ _process_registry: dict[str, dict[str, object]] = {}
 _processing_lock = Lock()
 _processing_channels: dict[str, datetime] = {}
 _cancelled_channels: set[str] = set()
-_active_processes: dict[str, subprocess.Popen[str]] = {}
+_active_processes: dict[str, subprocess.Popen] = {}
 _cancel_events: dict[str, Event] = {}
 _conversation_sessions: dict[str, str] = {}
 
@@ -332,6 +342,10 @@ def _get_related_processing_keys(lock_key: str) -> set[str]:
 
 _AGENTS_CACHE: dict[str, dict] = {}
 _CACHE_TTL_SECONDS = 60
+# Session lists are polled by the UI; a short TTL collapses bursts of polls
+# into one CLI call while staying fresh enough to show new sessions
+_SESSIONS_CACHE: dict[tuple[str, str | None], dict] = {}
+_SESSIONS_CACHE_TTL_SECONDS = 2
 REGISTERED_AGENT_CLI_CLASSES: tuple[type[AgentCLI], ...] = (
     OpenCodeDatabaseAgentCLI,
     OpenCodeAgentCLI,
@@ -385,27 +399,20 @@ class ChannelBusyError(RuntimeError):
 # Helper functions for backward compatibility with tests
 def _to_milliseconds(raw_value: object) -> int | None:
     """Convert value to milliseconds timestamp."""
-    try:
-        return int(float(raw_value))  # type: ignore
-    except (TypeError, ValueError):
-        return None
+    return to_milliseconds(raw_value)
 
 
 def _format_timestamp(raw_timestamp: int | float | str | None) -> str:
     """Format timestamp to ISO string."""
     try:
-        timestamp_value = (
-            float(raw_timestamp) / 1000 if raw_timestamp is not None else None
-        )
+        millis = float(raw_timestamp) if raw_timestamp is not None else None
     except (TypeError, ValueError):
-        timestamp_value = None
+        millis = None
 
-    dt = (
-        datetime.fromtimestamp(timestamp_value, tz=UTC)
-        if timestamp_value is not None
-        else datetime.now(UTC)
-    )
-    return dt.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    if millis is None:
+        # The current time never repeats, so keep it out of the memo cache
+        return format_epoch_milliseconds_uncached(time.time() * 1000)
+    return format_epoch_milliseconds(millis)
 
 
 def _format_timestamp_optional(raw_timestamp: int | float | str | None) -> str | None:
@@ -414,8 +421,7 @@ def _format_timestamp_optional(raw_timestamp: int | float | str | None) -> str |
     if millis is None:
         return None
 
-    dt = datetime.fromtimestamp(millis / 1000, tz=UTC)
-    return dt.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    return format_epoch_milliseconds(millis)
 
 
 def _resolve_message_timestamp(message_info: dict[str, object]) -> int | None:
@@ -424,11 +430,7 @@ def _resolve_message_timestamp(message_info: dict[str, object]) -> int | None:
     if not isinstance(time_info, dict):
         return None
 
-    for key in ("created", "start", "completed", "end", "updated"):
-        resolved = _to_milliseconds(time_info.get(key))
-        if resolved is not None:
-            return resolved
-    return None
+    return first_milliseconds(time_info, MESSAGE_TIME_KEYS)
 
 
 def _is_missing_session_error(error_message: str | None) -> bool:
@@ -450,19 +452,17 @@ def _resolve_part_timestamp(
     """Extract timestamp from part info."""
     time_info = part.get("time") or {}
     if isinstance(time_info, dict):
-        for key in ("end", "start"):
-            resolved = _to_milliseconds(time_info.get(key))
-            if resolved is not None:
-                return resolved
+        resolved = first_milliseconds(time_info, PART_TIME_KEYS)
+        if resolved is not None:
+            return resolved
 
     state = part.get("state")
     if isinstance(state, dict):
         state_time = state.get("time") or {}
         if isinstance(state_time, dict):
-            for key in ("end", "start"):
-                resolved = _to_milliseconds(state_time.get(key))
-                if resolved is not None:
-                    return resolved
+            resolved = first_milliseconds(state_time, PART_TIME_KEYS)
+            if resolved is not None:
+                return resolved
 
     resolved = _to_milliseconds(part.get("timestamp"))
     if resolved is not None:
@@ -517,7 +517,7 @@ def _register_cancel_event(channel: str) -> Event:
     return cancel_event
 
 
-def _register_active_process(channel: str, process: subprocess.Popen[str]) -> None:
+def _register_active_process(channel: str, process: subprocess.Popen) -> None:
     with _processing_lock:
         _active_processes[channel] = process
 
@@ -767,7 +767,7 @@ def terminate_agent_process(pid: int) -> bool:
 def _get_working_directory(channel: str) -> Path:
     """Determine the working directory based on the channel context."""
     # For repository chats, run opencode in the repository directory
-    if not channel.startswith("knowledge:") and not channel.startswith("constitution:"):
+    if not channel.startswith(("knowledge:", "constitution:")):
         workspace = get_workspace_home()
         repo_path = workspace / channel
         if repo_path.exists() and repo_path.is_dir():
@@ -899,6 +899,16 @@ def list_chat_sessions(
     )
 
     agent_cli = get_agent_cli(working_dir)
+    cache_key = (
+        agent_cli.cli_name,
+        os.fspath(working_dir) if working_dir is not None else None,
+    )
+    now = time.monotonic()
+    entry = _SESSIONS_CACHE.get(cache_key)
+    if entry and now - entry["timestamp"] < _SESSIONS_CACHE_TTL_SECONDS:
+        logger.debug("Returning cached sessions for '%s'", cache_key)
+        return [session.to_frontend_format() for session in entry["data"][:limit]]
+
     start_time = time.monotonic()
     result = agent_cli.list_sessions(working_dir)
     duration_seconds = time.monotonic() - start_time
@@ -919,6 +929,8 @@ def list_chat_sessions(
             raise FileNotFoundError(result.error_message)
         raise RuntimeError(result.error_message or "Failed to list sessions")
 
+    _SESSIONS_CACHE[cache_key] = {"data": result.sessions, "timestamp": now}
+
     # Apply limit and convert to frontend format
     limited_sessions = result.sessions[:limit]
     return [session.to_frontend_format() for session in limited_sessions]
@@ -1065,7 +1077,7 @@ def send_agent_message(
             start_time = time.monotonic()
             resolved_model = model if model and model != "default" else None
 
-            def on_process(process: subprocess.Popen[str]) -> None:
+            def on_process(process: subprocess.Popen) -> None:
                 _register_active_process(lock_key, process)
                 _record_process(
                     lock_key,
@@ -1077,15 +1089,20 @@ def send_agent_message(
                     working_directory=str(working_dir),
                 )
 
-            result = agent_cli.run_agent(
-                message,
-                active_session,
-                agent,
-                resolved_model,
-                working_dir,
-                cancel_event=cancel_event,
-                on_process=on_process,
-            )
+            try:
+                result = agent_cli.run_agent(
+                    message,
+                    active_session,
+                    agent,
+                    resolved_model,
+                    working_dir,
+                    cancel_event=cancel_event,
+                    on_process=on_process,
+                )
+            finally:
+                # A run can create a session or change its title and update
+                # time, even when it fails or raises partway through
+                _SESSIONS_CACHE.clear()
             duration_seconds = time.monotonic() - start_time
             logger.info(
                 "Agent CLI run completed (channel: %s, session: %s, duration=%.3fs)",
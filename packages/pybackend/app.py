@@ -215,7 +215,7 @@ def _start_shell(repo_path: Path) -> tuple[int, subprocess.Popen, str]:
             stdout=slave_fd,
             stderr=slave_fd,
             env=env,
-            preexec_fn=os.setsid,
+            start_new_session=True,
         )
     except Exception:
         os.close(master_fd)
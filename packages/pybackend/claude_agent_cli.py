@@ -117,7 +117,7 @@ class ClaudeCodeAgentCLI(AgentCLI):
         model: str | None,
         cwd: Path,
         cancel_event: Event | None = None,
-        on_process: Callable[[subprocess.Popen[str]], None] | None = None,
+        on_process: Callable[[subprocess.Popen], None] | None = None,
     ) -> RunResult:
         """Run `claude -p` and return a structured RunResult."""
 
@@ -378,8 +378,7 @@ class ClaudeCodeAgentCLI(AgentCLI):
 
         with open(session_file, "r", encoding="utf-8") as f:
             for line in f:
-                line = line.strip()
-                if not line:
+                if line.isspace():
                     continue
                 try:
                     entry = json.loads(line)
@@ -619,8 +618,7 @@ def _extract_session_summary(session_file: Path) -> tuple[str, str]:
 
         with open(session_file, "r", encoding="utf-8") as f:
             for line in f:
-                line = line.strip()
-                if not line:
+                if line.isspace():
                     continue
                 try:
                     entry = json.loads(line)
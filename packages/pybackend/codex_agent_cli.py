@@ -49,8 +49,8 @@ class CodexAgentCLI(AgentCLI):
         session_id = None
         response_parts = []
 
-        for line in stdout.strip().split("\n"):
-            if not line.strip():
+        for line in stdout.split("\n"):
+            if not line or line.isspace():
                 continue
             try:
                 event = json.loads(line)
@@ -161,7 +161,7 @@ class CodexAgentCLI(AgentCLI):
         model: str | None,
         cwd: Path,
         cancel_event: Event | None = None,
-        on_process: Callable[[subprocess.Popen[str]], None] | None = None,
+        on_process: Callable[[subprocess.Popen], None] | None = None,
     ) -> RunResult:
         """Run agent with message and return structured result."""
         try:
@@ -339,8 +339,7 @@ class CodexAgentCLI(AgentCLI):
         try:
             with open(session_file, "r", encoding="utf-8") as f:
                 for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
+                    if line.isspace():
                         continue
 
                     try:
@@ -456,8 +455,7 @@ class CodexAgentCLI(AgentCLI):
                                     # Try to get title from first message in session
                                     with open(session_file, "r", encoding="utf-8") as f:
                                         for line in f:
-                                            line = line.strip()
-                                            if not line:
+                                            if line.isspace():
                                                 continue
                                             try:
                                                 event = json.loads(line)
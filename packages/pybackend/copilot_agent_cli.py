@@ -1,5 +1,6 @@
 """Copilot CLI implementation of the AgentCLI interface."""
 
+import functools
 import json
 import logging
 import os
@@ -23,10 +24,70 @@ from agent_results import (
 
 logger = logging.getLogger(__name__)
 
+# Bound on the per-session metadata caches below
+_SESSION_CACHE_SIZE = 1024
+
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+_QUOTE_PREFIX_RE = re.compile(r"(?m)^>\s*")
+_LABEL_PREFIX_RE = re.compile(r"(?m)^\([^)]*\)\s*")
+
+
+# Session metadata is cached per (events.jsonl path, st_mtime_ns, st_size), so
+# a rewritten log is read again and old entries age out of the bounded cache.
+@functools.lru_cache(maxsize=_SESSION_CACHE_SIZE)
+def _read_session_cwd(events_file: str, mtime_ns: int, size: int) -> Path | None:
+    """Return the resolved cwd recorded in a log's session.start event."""
+    try:
+        with open(events_file, "r", encoding="utf-8") as f:
+            # Read first line to get session.start event
+            first_line = f.readline().strip()
+            if not first_line:
+                return None
+            event = json.loads(first_line)
+            if event.get("type") != "session.start":
+                return None
+            context = event.get("data", {}).get("context", {})
+            session_cwd = context.get("cwd")
+            if not session_cwd:
+                return None
+            return Path(session_cwd).resolve()
+    except (json.JSONDecodeError, OSError, AttributeError, TypeError) as e:
+        logger.debug(f"Error reading session metadata from {events_file}: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=_SESSION_CACHE_SIZE)
+def _read_session_title(events_file: str, mtime_ns: int, size: int) -> str:
+    """Return the session title taken from a log's first user message."""
+    title = "New conversation"
+    try:
+        with open(events_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.isspace():
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # Skip events that aren't objects rather than failing the listing
+                if not isinstance(event, dict) or event.get("type") != "user.message":
+                    continue
+                data = event.get("data")
+                content = data.get("content") if isinstance(data, dict) else None
+                if isinstance(content, str) and content:
+                    title = content[:50] + "..." if len(content) > 50 else content
+                break
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        pass
+    return title
+
 
 class CopilotAgentCLI(AgentCLI):
     """Copilot CLI implementation following the AgentCLI interface."""
 
+    # (COPILOT_SESSION_PATH value, resolved directory) of the last successful lookup
+    _sessions_dir_cache: tuple[str | None, Path] | None = None
+
     @classmethod
     def main_executable_name(cls) -> str:
         return "copilot"
@@ -51,8 +112,10 @@ class CopilotAgentCLI(AgentCLI):
 
     def _strip_ansi_codes(self, text: str) -> str:
         """Remove ANSI escape sequences from text."""
-        ansi_escape = re.compile(r"\x1b\[[0-9;]*m")
-        return ansi_escape.sub("", text)
+        # Most responses carry no escape codes at all
+        if "\x1b" not in text:
+            return text
+        return _ANSI_ESCAPE_RE.sub("", text)
 
     def _clean_response_text(self, text: str) -> str:
         """Normalize copilot CLI output for display."""
@@ -60,22 +123,36 @@ class CopilotAgentCLI(AgentCLI):
         if not cleaned:
             return cleaned
 
-        # Remove common Copilot CLI prefixes and formatting
-        cleaned = re.sub(r"(?m)^>\s*", "", cleaned)
-        cleaned = re.sub(r"(?m)^\([^)]*\)\s*", "", cleaned)
+        # Remove common Copilot CLI prefixes and formatting. Only run the
+        # substitutions when some line actually starts with the marker.
+        if cleaned.startswith(">") or "\n>" in cleaned:
+            cleaned = _QUOTE_PREFIX_RE.sub("", cleaned)
+        if cleaned.startswith("(") or "\n(" in cleaned:
+            cleaned = _LABEL_PREFIX_RE.sub("", cleaned)
         return cleaned.strip()
 
     def _get_sessions_directory(self) -> Path | None:
         """Get the path to Copilot's session state directory."""
-        # Check environment variable first
         configured = os.environ.get("COPILOT_SESSION_PATH")
+
+        # Reuse the last resolved directory while the configuration is unchanged.
+        # Misses are not cached so a directory created later is still picked up.
+        cached = self._sessions_dir_cache
+        if cached is not None and cached[0] == configured:
+            return cached[1]
+
+        # Check environment variable first
         if configured and Path(configured).expanduser().exists():
-            return Path(configured).expanduser()
+            sessions_dir = Path(configured).expanduser()
+        else:
+            # Fallback to standard location
+            copilot_home = Path.home() / ".copilot"
+            sessions_dir = copilot_home / "session-state"
+            if not sessions_dir.exists():
+                return None
 
-        # Fallback to standard location
-        copilot_home = Path.home() / ".copilot"
-        sessions_dir = copilot_home / "session-state"
-        return sessions_dir if sessions_dir.exists() else None
+        self._sessions_dir_cache = (configured, sessions_dir)
+        return sessions_dir
 
     def _get_directory_key(self, cwd: Path) -> str:
         """Get the directory key for session queries."""
@@ -104,48 +181,38 @@ class CopilotAgentCLI(AgentCLI):
             return False
 
         # Copilot CLI session directories are named with session IDs
-        session_path = sessions_dir / session_id
-        if not session_path.exists():
+        events_file = sessions_dir / session_id / "events.jsonl"
+        session_cwd_path = self._get_session_cwd(session_id, events_file)
+        if session_cwd_path is None:
             return False
 
-        # Read workspace information from events.jsonl
-        events_file = session_path / "events.jsonl"
-        if not events_file.exists():
-            return False
+        cwd_resolved = cwd.resolve()
 
+        # Check if paths are related (parent/child relationship)
         try:
-            with open(events_file, "r", encoding="utf-8") as f:
-                # Read first line to get session.start event
-                first_line = f.readline().strip()
-                if first_line:
-                    event = json.loads(first_line)
-                    if event.get("type") == "session.start":
-                        context = event.get("data", {}).get("context", {})
-                        session_cwd = context.get("cwd")
-
-                        if session_cwd:
-                            session_cwd_path = Path(session_cwd).resolve()
-                            cwd_resolved = cwd.resolve()
-
-                            # Check if paths are related (parent/child relationship)
-                            try:
-                                cwd_resolved.relative_to(session_cwd_path)
-                                return True
-                            except ValueError:
-                                pass
-
-                            try:
-                                session_cwd_path.relative_to(cwd_resolved)
-                                return True
-                            except ValueError:
-                                pass
+            cwd_resolved.relative_to(session_cwd_path)
+            return True
+        except ValueError:
+            pass
 
-        except (json.JSONDecodeError, OSError, AttributeError) as e:
-            logger.debug(f"Error reading session metadata for {session_id}: {e}")
-            return False
+        try:
+            session_cwd_path.relative_to(cwd_resolved)
+            return True
+        except ValueError:
+            pass
 
         return False
 
+    def _get_session_cwd(self, session_id: str, events_file: Path) -> Path | None:
+        """Return the resolved workspace directory recorded for a session."""
+        try:
+            stat_result = events_file.stat()
+        except OSError:
+            return None
+        return _read_session_cwd(
+            str(events_file), stat_result.st_mtime_ns, stat_result.st_size
+        )
+
     def run_agent(
         self,
         message: str,
@@ -154,7 +221,7 @@ class CopilotAgentCLI(AgentCLI):
         model: str | None,
         cwd: Path,
         cancel_event: Event | None = None,
-        on_process: Callable[[subprocess.Popen[str]], None] | None = None,
+        on_process: Callable[[subprocess.Popen], None] | None = None,
     ) -> RunResult:
         """Run agent with message and return structured result."""
         try:
@@ -288,93 +355,94 @@ class CopilotAgentCLI(AgentCLI):
                 error_message=f"Error: {str(e)}",
             )
 
+    def _read_event_lines(self, events_file: Path) -> list[bytes]:
+        """Return the raw lines of an events log, read in one call."""
+        with open(events_file, "rb") as f:
+            return f.read().splitlines()
+
     def _parse_events_jsonl(self, events_file: Path) -> list[HistoryMessage]:
         """Parse Copilot events.jsonl file into HistoryMessage objects."""
         messages: list[HistoryMessage] = []
 
         try:
-            with open(events_file, "r", encoding="utf-8") as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        event = json.loads(line)
-                        event_type = event.get("type", "")
-                        event_data = event.get("data", {})
-
-                        # Convert timestamp if present
-                        timestamp_ms = None
-                        if "timestamp" in event:
-                            timestamp_ms = self._to_milliseconds(event["timestamp"])
-
-                        # Process different event types
-                        if event_type == "user.message":
-                            content = event_data.get("content", "")
-                            messages.append(
-                                HistoryMessage(
-                                    message_id=f"user-{line_num}",
-                                    role="user",
-                                    content_type="text",
-                                    content=content,
-                                    timestamp=timestamp_ms,
-                                )
+            lines = self._read_event_lines(events_file)
+            for line_num, line in enumerate(lines, 1):
+                if not line or line.isspace():
+                    continue
+
+                try:
+                    event = json.loads(line)
+                    event_type = event.get("type", "")
+                    event_data = event.get("data", {})
+
+                    # Convert timestamp if present
+                    timestamp_ms = None
+                    if "timestamp" in event:
+                        timestamp_ms = self._to_milliseconds(event["timestamp"])
+
+                    # Process different event types
+                    if event_type == "user.message":
+                        content = event_data.get("content", "")
+                        messages.append(
+                            HistoryMessage(
+                                message_id=f"user-{line_num}",
+                                role="user",
+                                content_type="text",
+                                content=content,
+                                timestamp=timestamp_ms,
                             )
-                        elif event_type == "assistant.message":
-                            content = event_data.get("content", "")
-
-                            # If content is empty, try to extract tool call information
-                            if not content and "toolRequests" in event_data:
-                                tool_requests = event_data["toolRequests"]
-                                if tool_requests:
-                                    # Generate a summary of tool calls
-                                    tool_names = [
-                                        tr.get("name", "unknown")
-                                        for tr in tool_requests
-                                    ]
-                                    content = f"Calling {len(tool_names)} tool(s): {', '.join(tool_names)}"
-
-                            messages.append(
-                                HistoryMessage(
-                                    message_id=f"assistant-{line_num}",
-                                    role="assistant",
-                                    content_type="text",
-                                    content=content,
-                                    timestamp=timestamp_ms,
-                                )
+                        )
+                    elif event_type == "assistant.message":
+                        content = event_data.get("content", "")
+
+                        # If content is empty, try to extract tool call information
+                        if not content and "toolRequests" in event_data:
+                            tool_requests = event_data["toolRequests"]
+                            if tool_requests:
+                                # Generate a summary of tool calls
+                                tool_names = [
+                                    tr.get("name", "unknown") for tr in tool_requests
+                                ]
+                                content = f"Calling {len(tool_names)} tool(s): {', '.join(tool_names)}"
+
+                        messages.append(
+                            HistoryMessage(
+                                message_id=f"assistant-{line_num}",
+                                role="assistant",
+                                content_type="text",
+                                content=content,
+                                timestamp=timestamp_ms,
                             )
-                        elif event_type == "tool.execution_start":
-                            tool_name = event_data.get("toolName", "unknown")
-                            tool_info = f"Tool started: {tool_name}"
-                            messages.append(
-                                HistoryMessage(
-                                    message_id=f"tool-start-{line_num}",
-                                    role="assistant",
-                                    content_type="tool",
-                                    content=tool_info,
-                                    timestamp=timestamp_ms,
-                                )
+                        )
+                    elif event_type == "tool.execution_start":
+                        tool_name = event_data.get("toolName", "unknown")
+                        tool_info = f"Tool started: {tool_name}"
+                        messages.append(
+                            HistoryMessage(
+                                message_id=f"tool-start-{line_num}",
+                                role="assistant",
+                                content_type="tool",
+                                content=tool_info,
+                                timestamp=timestamp_ms,
                             )
-                        elif event_type == "tool.execution_end":
-                            tool_name = event_data.get("toolName", "unknown")
-                            tool_info = f"Tool completed: {tool_name}"
-                            if "result" in event_data:
-                                tool_info += (
-                                    f"\nResult: {str(event_data['result'])[:200]}"
-                                )
-                            messages.append(
-                                HistoryMessage(
-                                    message_id=f"tool-end-{line_num}",
-                                    role="assistant",
-                                    content_type="tool",
-                                    content=tool_info,
-                                    timestamp=timestamp_ms,
-                                )
+                        )
+                    elif event_type == "tool.execution_end":
+                        tool_name = event_data.get("toolName", "unknown")
+                        tool_info = f"Tool completed: {tool_name}"
+                        if "result" in event_data:
+                            tool_info += f"\nResult: {str(event_data['result'])[:200]}"
+                        messages.append(
+                            HistoryMessage(
+                                message_id=f"tool-end-{line_num}",
+                                role="assistant",
+                                content_type="tool",
+                                content=tool_info,
+                                timestamp=timestamp_ms,
                             )
-                    except json.JSONDecodeError:
-                        # Skip malformed JSON lines
-                        continue
+                        )
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # Skip malformed JSON lines
+                    continue
 
         except FileNotFoundError:
             # Return empty list if file doesn't exist
@@ -385,6 +453,12 @@ class CopilotAgentCLI(AgentCLI):
 
         return messages
 
+    def _get_session_title(self, events_file: Path, stat_result: os.stat_result) -> str:
+        """Return the session title, reusing it while events.jsonl is unchanged."""
+        return _read_session_title(
+            str(events_file), stat_result.st_mtime_ns, stat_result.st_size
+        )
+
     def list_sessions(self, cwd: Path | None) -> SessionListResult:
         """List available sessions and return structured result."""
         try:
@@ -398,12 +472,13 @@ class CopilotAgentCLI(AgentCLI):
 
             sessions = []
 
-            # Scan session directories
+            # Scan session directories; DirEntry.is_dir() reuses the file type
+            # from the directory listing instead of stat()ing every entry
             if sessions_dir.exists():
-                for session_dir in sessions_dir.iterdir():
-                    if not session_dir.is_dir():
-                        continue
+                with os.scandir(sessions_dir) as entries:
+                    session_dirs = [Path(e.path) for e in entries if e.is_dir()]
 
+                for session_dir in session_dirs:
                     session_id = session_dir.name
 
                     # Filter by workspace if cwd is provided
@@ -412,44 +487,22 @@ class CopilotAgentCLI(AgentCLI):
 
                     events_file = session_dir / "events.jsonl"
 
-                    if not events_file.exists():
+                    # A single stat() both checks for the file and gives its mtime
+                    try:
+                        stat_result = events_file.stat()
+                    except OSError:
                         continue
 
-                    # Extract title from first user message
-                    title = "New conversation"
                     updated = "Unknown"
-
                     try:
                         # Get file modification time
-                        mtime = events_file.stat().st_mtime
-                        dt = datetime.fromtimestamp(mtime)
+                        dt = datetime.fromtimestamp(stat_result.st_mtime)
                         updated = dt.strftime("%Y-%m-%d %H:%M:%S")
-
-                        # Try to get title from first user message
-                        with open(events_file, "r", encoding="utf-8") as f:
-                            for line in f:
-                                line = line.strip()
-                                if not line:
-                                    continue
-                                try:
-                                    event = json.loads(line)
-                                    if event.get("type") == "user.message":
-                                        content = event.get("data", {}).get(
-                                            "content", ""
-                                        )
-                                        if content:
-                                            title = (
-                                                content[:50] + "..."
-                                                if len(content) > 50
-                                                else content
-                                            )
-                                        break
-                                except json.JSONDecodeError:
-                                    continue
-
                     except Exception:
                         pass
 
+                    title = self._get_session_title(events_file, stat_result)
+
                     sessions.append(
                         SessionInfo(session_id=session_id, title=title, updated=updated)
                     )
@@ -116,7 +116,7 @@ class KiroAgentCLI(AgentCLI):
         model: str | None,
         cwd: Path,
         cancel_event: Event | None = None,
-        on_process: Callable[[subprocess.Popen[str]], None] | None = None,
+        on_process: Callable[[subprocess.Popen], None] | None = None,
     ) -> RunResult:
         """Run agent with message and return structured result."""
         try:
@@ -51,7 +51,7 @@ class OB1AgentCLI(AgentCLI):
         model: str | None,
         cwd: Path,
         cancel_event: Event | None = None,
-        on_process: Callable[[subprocess.Popen[str]], None] | None = None,
+        on_process: Callable[[subprocess.Popen], None] | None = None,
     ) -> RunResult:
         """Run OB1 with message and return structured result."""
 
@@ -184,8 +184,8 @@ class OB1AgentCLI(AgentCLI):
 
             for session_file in session_files:
                 if session_id in str(session_file):
-                    with open(session_file, "r") as f:
-                        session_data = json.load(f)
+                    with open(session_file, "rb") as f:
+                        session_data = json.loads(f.read())
 
                     messages = self._parse_ob1_session_data(session_data)
 
@@ -285,8 +285,8 @@ class OB1AgentCLI(AgentCLI):
                 session_id = session_file.stem.replace("session-", "")
 
                 try:
-                    with open(session_file, "r") as f:
-                        session_data = json.load(f)
+                    with open(session_file, "rb") as f:
+                        session_data = json.loads(f.read())
 
                     # Extract session info
                     created_at = session_data.get("created_at", "Unknown")
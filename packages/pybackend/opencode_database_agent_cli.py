@@ -8,7 +8,6 @@ import sqlite3
 import json
 import logging
 import os
-import re
 from pathlib import Path
 from typing import Any, Callable
 from threading import Event
@@ -16,7 +15,7 @@ import subprocess
 from datetime import datetime
 from collections import defaultdict
 
-from agent_cli import AgentCLI
+from agent_cli import AGENT_ROW_PATTERN, AgentCLI
 from agent_results import (
     ExportResult,
     SessionListResult,
@@ -30,9 +29,6 @@ from agent_results import (
 
 logger = logging.getLogger(__name__)
 
-# Regex patterns for parsing CLI output
-AGENT_ROW_PATTERN = re.compile(r"^(?P<name>\S+)\s+\((?P<kind>[^)]+)\)\s*$")
-
 
 class OpenCodeDatabaseAgentCLI(AgentCLI):
     """Hybrid OpenCode agent CLI implementation.
@@ -63,13 +59,17 @@ class OpenCodeDatabaseAgentCLI(AgentCLI):
     ) -> tuple[str | None, list[ResponsePart]]:
         """Parse OpenCode JSON output into structured response parts."""
         session_id = None
-        parsed: list[tuple[str, str, Any, object, object]] = []
+        response_parts: list[ResponsePart] = []
+        last_text_index = -1
 
         for line in stdout.splitlines():
-            if not line.strip():
+            # Every event is a JSON object; banner and log lines are skipped
+            # without raising a decode error
+            stripped = line.lstrip()
+            if not stripped.startswith("{"):
                 continue
             try:
-                payload = json.loads(line)
+                payload = json.loads(stripped)
             except json.JSONDecodeError:
                 continue
 
@@ -79,55 +79,40 @@ class OpenCodeDatabaseAgentCLI(AgentCLI):
 
             part = payload.get("part") or {}
             payload_type = payload.get("type") or part.get("type")
-            part_id = part.get("id")
-            call_id = part.get("callID") or part.get("callId")
-            timestamp = payload.get("timestamp") or part.get("timestamp")
 
             if payload_type == "text":
-                parsed.append(
-                    (
-                        "text",
-                        self._extract_part_content(part, "text"),
-                        timestamp,
-                        part_id,
-                        call_id,
-                    )
-                )
+                last_text_index = len(response_parts)
+                part_type = "thinking"
+                content = self._extract_part_content(part, "text")
             elif payload_type == "reasoning":
-                parsed.append(
-                    (
-                        "reasoning",
-                        self._extract_part_content(part, "reasoning"),
-                        timestamp,
-                        part_id,
-                        call_id,
-                    )
-                )
+                part_type = "thinking"
+                content = self._extract_part_content(part, "reasoning")
             elif payload_type in {"tool_use", "tool"}:
-                tool_name = self._extract_part_content(part, payload_type)
-                if tool_name:
-                    parsed.append(("tool", tool_name, timestamp, part_id, call_id))
+                part_type = "tool"
+                content = self._extract_part_content(part, payload_type)
+                if not content:
+                    continue
+            else:
+                continue
 
-        text_indices = [index for index, part in enumerate(parsed) if part[0] == "text"]
-        response_parts: list[ResponsePart] = []
-        for index, (kind, content, timestamp, part_id, call_id) in enumerate(parsed):
-            part_type = (
-                "final"
-                if kind == "text" and index == text_indices[-1]
-                else "thinking"
-                if kind in {"text", "reasoning"}
-                else "tool"
-            )
+            part_id = part.get("id")
+            call_id = part.get("callID") or part.get("callId")
             response_parts.append(
                 ResponsePart(
                     text=content,
-                    timestamp=self._to_milliseconds(timestamp),
+                    timestamp=self._to_milliseconds(
+                        payload.get("timestamp") or part.get("timestamp")
+                    ),
                     part_type=part_type,
                     part_id=str(part_id) if part_id else None,
                     call_id=str(call_id) if call_id else None,
                 )
             )
 
+        # The last text part is the final answer; earlier ones are thinking
+        if last_text_index >= 0:
+            response_parts[last_text_index].part_type = "final"
+
         return session_id, response_parts
 
     def _get_database_path(self) -> Path | None:
@@ -566,7 +551,7 @@ class OpenCodeDatabaseAgentCLI(AgentCLI):
         model: str | None,
         cwd: Path,
         cancel_event: Event | None = None,
-        on_process: Callable[[subprocess.Popen[str]], None] | None = None,
+        on_process: Callable[[subprocess.Popen], None] | None = None,
     ) -> RunResult:
         """Run agent with message using CLI subprocess and return structured result."""
         try:
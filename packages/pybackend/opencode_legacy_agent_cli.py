@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+import io
 import json
+import logging
 import subprocess
-import tempfile
 from pathlib import Path
-from threading import Event
-from typing import Callable
+from threading import Event, Thread
+from typing import IO, Callable, Iterable
 
 from agent_cli import (
     AgentCLI,
     SESSION_ROW_PATTERN,
     AGENT_ROW_PATTERN,
+    MESSAGE_TIME_KEYS,
+    PART_TIME_KEYS,
+    first_milliseconds,
 )
 from agent_results import (
     RunResult,
@@ -23,6 +27,50 @@ from agent_results import (
     ResponsePart,
 )
 
+logger = logging.getLogger(__name__)
+
+# Event and export filters used in the per-part loops
+_TOOL_PART_TYPES = frozenset(("tool_use", "tool"))
+_HISTORY_ROLES = frozenset(("user", "assistant"))
+_HISTORY_PART_TYPES = frozenset(("text", "tool_use", "tool"))
+
+# Part fields holding displayable content, first non-empty one wins
+_PART_CONTENT_KEYS: dict[str, tuple[str, ...]] = {
+    "text": ("text",),
+    "tool_use": ("tool", "name", "id"),
+    "tool": ("tool", "name", "id"),
+}
+
+# Bound once so the row loops skip the attribute lookup per line
+_match_session_row = SESSION_ROW_PATTERN.match
+_match_agent_row = AGENT_ROW_PATTERN.match
+
+# Substrings any text, reasoning or tool event line contains
+_EVENT_TYPE_MARKERS = (b'"text"', b'"reasoning"', b'"tool')
+
+
+def _part_call_id(part: dict[str, object]) -> str | None:
+    """Return a part's tool call ID, which opencode spells callID or callId."""
+    return part.get("callID") or part.get("callId")
+
+
+def _split_session_row(row: str) -> tuple[str, str, str] | None:
+    """Split a stripped 'ses_...' row on its two-space column gaps.
+
+    Returns None for rows SESSION_ROW_PATTERN has to decide instead, such as
+    tab-separated rows or rows with an empty title.
+    """
+    if "\t" in row:
+        return None
+    session_id, sep, rest = row.partition("  ")
+    if not sep or " " in session_id:
+        return None
+    title, sep, updated = rest.lstrip(" ").partition("  ")
+    updated = updated.strip(" ")
+    if not sep or not updated:
+        return None
+    return session_id, title, updated
+
 
 class OpenCodeAgentCLI(AgentCLI):
     @classmethod
@@ -42,28 +90,44 @@ class OpenCodeAgentCLI(AgentCLI):
 
     def _extract_part_content(self, part: dict[str, object], part_type: str) -> str:
         """Extract content from a response part."""
-        if part_type in {"text"}:
-            return str(part.get("text") or "")
-        if part_type in {"tool_use", "tool"}:
-            for key in ("tool", "name", "id"):
-                if part.get(key):
-                    return str(part[key])
-            return ""
+        for key in _PART_CONTENT_KEYS.get(part_type, ()):
+            value = part.get(key)
+            if value:
+                return value if isinstance(value, str) else str(value)
         return ""
 
     def _parse_opencode_output(
-        self, stdout: str
+        self, stdout: str | bytes
     ) -> tuple[str | None, list[ResponsePart]]:
         """Parse opencode JSON output into structured response parts."""
+        # The streaming run path reads bytes; other callers are normalised to it
+        if isinstance(stdout, str):
+            stdout = stdout.encode("utf-8")
+        return self._parse_opencode_lines(stdout.splitlines())
+
+    def _parse_opencode_lines(
+        self, lines: Iterable[bytes]
+    ) -> tuple[str | None, list[ResponsePart]]:
+        """Parse opencode JSON lines, consuming them as they are produced."""
         session_id = None
-        parts: list[dict[str, object]] = []
+        response_parts: list[ResponsePart] = []
+        last_text_index = -1
 
-        for line in stdout.splitlines():
-            if not line.strip():
+        for line in lines:
+            # Banners and log lines are rejected without raising a decode error;
+            # every event is a JSON object
+            stripped = line.lstrip()
+            if not stripped.startswith(b"{"):
+                continue
+            # Once the session is known, only text, reasoning and tool events
+            # matter; metadata events are skipped without being decoded
+            if session_id is not None and not any(
+                marker in stripped for marker in _EVENT_TYPE_MARKERS
+            ):
                 continue
             try:
-                payload = json.loads(line)
-            except json.JSONDecodeError:
+                payload = json.loads(stripped)
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
 
             payload_session_id = payload.get("sessionID")
@@ -71,112 +135,66 @@ class OpenCodeAgentCLI(AgentCLI):
                 session_id = payload_session_id
 
             payload_type = payload.get("type")
-            payload_timestamp = payload.get("timestamp")
             part = payload.get("part") or {}
 
-            part_id = part.get("id")
-            call_id = part.get("callID") or part.get("callId")
-
             if payload_type == "text":
-                text = self._extract_part_content(part, "text")
                 # Include all text parts, even empty ones, to maintain conversation flow
-                parts.append(
-                    {
-                        "kind": "text",
-                        "content": text,
-                        "timestamp": payload_timestamp,
-                        "part_id": part_id,
-                        "call_id": call_id,
-                    }
-                )
+                last_text_index = len(response_parts)
+                part_type = "thinking"
+                content = self._extract_part_content(part, "text")
             elif payload_type == "reasoning":
-                parts.append(
-                    {
-                        "kind": "reasoning",
-                        "content": self._extract_part_content(part, "reasoning"),
-                        "timestamp": payload_timestamp,
-                        "part_id": part_id,
-                        "call_id": call_id,
-                    }
-                )
-            elif payload_type in {"tool_use", "tool"}:
-                tool_name = self._extract_part_content(part, payload_type)
-                if tool_name:  # Only include tools if they have content
-                    parts.append(
-                        {
-                            "kind": "tool",
-                            "content": tool_name,
-                            "timestamp": payload_timestamp,
-                            "part_id": part_id,
-                            "call_id": call_id,
-                        }
-                    )
-
-        if not parts:
-            return session_id, []
-
-        response_parts: list[ResponsePart] = []
-        text_indices = [
-            index for index, part in enumerate(parts) if part.get("kind") == "text"
-        ]
-
-        for index, part in enumerate(parts):
-            kind = part.get("kind")
-            content = str(part.get("content", ""))
-            raw_timestamp = part.get("timestamp")
-            timestamp = self._to_milliseconds(raw_timestamp)
-
-            if kind == "text":
-                part_type = (
-                    "final"
-                    if text_indices and index == text_indices[-1]
-                    else "thinking"
-                )
-            elif kind == "reasoning":
                 part_type = "thinking"
-            else:
+                content = self._extract_part_content(part, "reasoning")
+            elif payload_type in _TOOL_PART_TYPES:
                 part_type = "tool"
+                content = self._extract_part_content(part, payload_type)
+                if not content:  # Only include tools if they have content
+                    continue
+            else:
+                continue
 
             response_parts.append(
                 ResponsePart(
-                    text=content,
-                    timestamp=timestamp,
+                    text=str(content),
+                    timestamp=self._to_milliseconds(payload.get("timestamp")),
                     part_type=part_type,
-                    part_id=part.get("part_id"),
-                    call_id=part.get("call_id"),
+                    part_id=part.get("id"),
+                    call_id=_part_call_id(part),
                 )
             )
 
+        # Only the last text part is the final answer; earlier ones are thinking
+        if last_text_index >= 0:
+            response_parts[last_text_index].part_type = "final"
+
         return session_id, response_parts
 
     def _parse_session_table(self, output: str, limit: int) -> list[SessionInfo]:
         """Parse session list table output."""
         sessions: list[SessionInfo] = []
+        # Checked once per table so unmatched rows skip the logging call
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         for line in output.splitlines():
             stripped = line.strip()
-            if (
-                not stripped
-                or stripped.startswith("Session ID")
-                or stripped.startswith("─")
-            ):
-                continue
-
-            match = SESSION_ROW_PATTERN.match(stripped)
-            if not match:
-                import logging
-
-                logging.getLogger(__name__).debug(
-                    "Skipping non-matching session row: %s", stripped
-                )
-                continue
+            fields = (
+                _split_session_row(stripped) if stripped.startswith("ses_") else None
+            )
+            if fields is None:
+                # Rows the column split can't settle go through the full pattern
+                match = _match_session_row(stripped)
+                if not match:
+                    if (
+                        debug_enabled
+                        and stripped
+                        and not stripped.startswith(("Session ID", "─"))
+                    ):
+                        logger.debug("Skipping non-matching session row: %s", stripped)
+                    continue
+                fields = match.groups()
 
-            session_id, title, updated = match.groups()
+            session_id, title, updated = fields
             sessions.append(
-                SessionInfo(
-                    session_id=session_id.strip(),
-                    title=title.strip(),
-                    updated=updated.strip(),
-                )
+                SessionInfo(session_id=session_id, title=title, updated=updated)
             )
 
             if len(sessions) >= limit:
@@ -194,7 +212,7 @@ class OpenCodeAgentCLI(AgentCLI):
             if not stripped:
                 continue
 
-            match = AGENT_ROW_PATTERN.match(stripped)
+            match = _match_agent_row(stripped)
             if match:
                 current_agent = AgentInfo(
                     name=match.group("name"), agent_type=match.group("kind"), details=[]
@@ -216,14 +234,15 @@ class OpenCodeAgentCLI(AgentCLI):
         for message in messages:
             message_info = message.get("info") or {}
             role = message_info.get("role")
-            if role not in {"user", "assistant"}:
+            if role not in _HISTORY_ROLES:
                 continue
 
+            message_id = message_info.get("id")
             message_timestamp = self._resolve_message_timestamp(message_info)
 
             for part in message.get("parts") or []:
                 part_type = part.get("type")
-                if part_type not in {"text", "tool_use", "tool"}:
+                if part_type not in _HISTORY_PART_TYPES:
                     continue
 
                 part_timestamp = self._resolve_part_timestamp(part, message_timestamp)
@@ -233,13 +252,13 @@ class OpenCodeAgentCLI(AgentCLI):
 
                 history.append(
                     HistoryMessage(
-                        message_id=message_info.get("id"),
+                        message_id=message_id,
                         role=role,
                         content_type=part_type,
                         content=self._extract_part_content(part, part_type),
                         timestamp=part_timestamp,
                         part_id=part.get("id"),
-                        call_id=part.get("callID") or part.get("callId"),
+                        call_id=_part_call_id(part),
                     )
                 )
 
@@ -251,11 +270,7 @@ class OpenCodeAgentCLI(AgentCLI):
         if not isinstance(time_info, dict):
             return None
 
-        for key in ("created", "start", "completed", "end", "updated"):
-            resolved = self._to_milliseconds(time_info.get(key))
-            if resolved is not None:
-                return resolved
-        return None
+        return first_milliseconds(time_info, MESSAGE_TIME_KEYS)
 
     def _resolve_part_timestamp(
         self, part: dict[str, object], fallback: int | None
@@ -263,19 +278,17 @@ class OpenCodeAgentCLI(AgentCLI):
         """Extract timestamp from part info."""
         time_info = part.get("time") or {}
         if isinstance(time_info, dict):
-            for key in ("end", "start"):
-                resolved = self._to_milliseconds(time_info.get(key))
-                if resolved is not None:
-                    return resolved
+            resolved = first_milliseconds(time_info, PART_TIME_KEYS)
+            if resolved is not None:
+                return resolved
 
         state = part.get("state")
         if isinstance(state, dict):
             state_time = state.get("time") or {}
             if isinstance(state_time, dict):
-                for key in ("end", "start"):
-                    resolved = self._to_milliseconds(state_time.get(key))
-                    if resolved is not None:
-                        return resolved
+                resolved = first_milliseconds(state_time, PART_TIME_KEYS)
+                if resolved is not None:
+                    return resolved
 
         resolved = self._to_milliseconds(part.get("timestamp"))
         if resolved is not None:
@@ -291,7 +304,7 @@ class OpenCodeAgentCLI(AgentCLI):
         model: str | None,
         cwd: Path,
         cancel_event: Event | None = None,
-        on_process: Callable[[subprocess.Popen[str]], None] | None = None,
+        on_process: Callable[[subprocess.Popen], None] | None = None,
     ) -> RunResult:
         """Run agent with message and return structured result."""
         try:
@@ -312,60 +325,23 @@ class OpenCodeAgentCLI(AgentCLI):
                     error_message="Agent request cancelled.",
                 )
 
-            if cancel_event is None and on_process is None:
-                process = subprocess.run(
-                    command,
-                    input=message,
-                    capture_output=True,
-                    text=True,
-                    cwd=cwd,
-                )
-                stdout = process.stdout
-                stderr = process.stderr
-            else:
-                process = subprocess.Popen(
-                    command,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    cwd=cwd,
-                )
-                if on_process:
-                    on_process(process)
-
-                input_data: str | None = message
-                while True:
-                    try:
-                        stdout, stderr = process.communicate(
-                            input=input_data, timeout=0.1
-                        )
-                        break
-                    except subprocess.TimeoutExpired:
-                        input_data = None
-                        if cancel_event and cancel_event.is_set():
-                            process.terminate()
-                            try:
-                                stdout, stderr = process.communicate(timeout=1)
-                            except subprocess.TimeoutExpired:
-                                process.kill()
-                                stdout, stderr = process.communicate()
-                            return RunResult(
-                                success=False,
-                                session_id=session_id,
-                                response_parts=[],
-                                error_message="Agent request cancelled.",
-                            )
+            # Always stream so events are parsed as they arrive and only one
+            # line is held at a time. Binary pipes hand events to the JSON
+            # parser as bytes without a per-line text decoding layer
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=io.DEFAULT_BUFFER_SIZE,
+                cwd=cwd,
+            )
+            parsed_session_id, parsed_parts, stderr = self._stream_opencode_run(
+                process, message, cancel_event, on_process
+            )
 
             if process.returncode == 0:
-                extracted_session_id = session_id
-                parsed_parts: list[ResponsePart] = []
-                if stdout:
-                    parsed_session_id, parsed_parts = self._parse_opencode_output(
-                        stdout
-                    )
-                    if parsed_session_id:
-                        extracted_session_id = parsed_session_id
+                extracted_session_id = parsed_session_id or session_id
 
                 if not extracted_session_id:
                     import time
@@ -385,7 +361,9 @@ class OpenCodeAgentCLI(AgentCLI):
                         response_parts=[],
                         error_message="Agent request cancelled.",
                     )
-                error_msg = (stderr or "").strip() or "Command failed with no output"
+                error_msg = (stderr or b"").decode(
+                    "utf-8", "replace"
+                ).strip() or "Command failed with no output"
                 return RunResult(
                     success=False,
                     session_id=session_id,
@@ -407,50 +385,120 @@ class OpenCodeAgentCLI(AgentCLI):
                 error_message=f"Error: {str(e)}",
             )
 
+    def _stream_opencode_run(
+        self,
+        process: subprocess.Popen[bytes],
+        message: str,
+        cancel_event: Event | None,
+        on_process: Callable[[subprocess.Popen], None] | None = None,
+    ) -> tuple[str | None, list[ResponsePart], bytes]:
+        """Send the prompt and parse stdout line by line while the run executes."""
+        # Unlike communicate(), the event stream is never buffered whole and
+        # parsing overlaps with the agent's output. The prompt is written and
+        # stderr drained on helper threads, so a large prompt or a full pipe
+        # can never block the stdout reader or the process.
+        stderr_chunks: list[bytes] = []
+        stderr_reader = Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+        )
+        stdin_writer = Thread(
+            target=self._write_prompt, args=(process.stdin, message), daemon=True
+        )
+        stderr_reader.start()
+        stdin_writer.start()
+
+        if cancel_event is not None:
+            Thread(
+                target=self._terminate_on_cancel,
+                args=(process, cancel_event),
+                daemon=True,
+            ).start()
+
+        try:
+            # The hook runs inside the guarded block so a failing hook
+            # can't leak the process either
+            if on_process:
+                on_process(process)
+            session_id, parts = self._parse_opencode_lines(process.stdout)
+        except BaseException:
+            # Nothing reads the output anymore; don't leave the agent running
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            process.wait()
+            stdin_writer.join()
+            stderr_reader.join()
+            process.stderr.close()
+        return session_id, parts, b"".join(stderr_chunks)
+
+    @staticmethod
+    def _write_prompt(stdin: IO[bytes], message: str) -> None:
+        """Write the prompt to the process and close its stdin."""
+        try:
+            with stdin:
+                stdin.write(message.encode("utf-8"))
+        except BrokenPipeError:
+            # The process exited before reading its prompt; stderr says why
+            pass
+
+    @staticmethod
+    def _terminate_on_cancel(process: subprocess.Popen[bytes], cancel_event: Event):
+        """Stop the process once cancel_event is set, escalating to kill."""
+        while process.poll() is None:
+            if cancel_event.wait(0.1):
+                process.terminate()
+                try:
+                    process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                return
+
     def export_session(self, session_id: str, cwd: Path | None) -> ExportResult:
         """Export session history and return structured result."""
         try:
-            with tempfile.NamedTemporaryFile(
-                mode="w+", encoding="utf-8", delete=True
-            ) as tmp:
-                result = subprocess.run(
-                    ["opencode", "export", session_id],
-                    stdout=tmp,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    cwd=cwd,
-                )
-
-                if result.returncode != 0:
-                    error_message = (
-                        result.stderr or ""
-                    ).strip() or "Failed to export session history"
-                    return ExportResult(
-                        success=False,
-                        session_id=session_id,
-                        messages=[],
-                        error_message=error_message,
-                    )
-
-                tmp.flush()
-                tmp.seek(0)
-                try:
-                    export_payload = json.load(tmp)
-                except json.JSONDecodeError:
-                    return ExportResult(
-                        success=False,
-                        session_id=session_id,
-                        messages=[],
-                        error_message="Invalid export data returned by opencode",
-                    )
+            # Capture the export straight from the pipe as bytes and decode it
+            # once; no temporary file round trip
+            result = subprocess.run(
+                ["opencode", "export", session_id],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=cwd,
+            )
 
-                messages = export_payload.get("messages") or []
-                parsed_messages = self._parse_export_messages(messages, None)
+            if result.returncode != 0:
+                error_message = (result.stderr or b"").decode(
+                    "utf-8", "replace"
+                ).strip() or "Failed to export session history"
+                return ExportResult(
+                    success=False,
+                    session_id=session_id,
+                    messages=[],
+                    error_message=error_message,
+                )
 
+            try:
+                export_payload = json.loads(result.stdout)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                logger.warning(
+                    "Invalid export data for session %s (first bytes: %r)",
+                    session_id,
+                    result.stdout[:600],
+                )
                 return ExportResult(
-                    success=True, session_id=session_id, messages=parsed_messages
+                    success=False,
+                    session_id=session_id,
+                    messages=[],
+                    error_message="Invalid export data returned by opencode",
                 )
 
+            messages = export_payload.get("messages") or []
+            parsed_messages = self._parse_export_messages(messages, None)
+
+            return ExportResult(
+                success=True, session_id=session_id, messages=parsed_messages
+            )
+
         except FileNotFoundError:
             return ExportResult(
                 success=False,
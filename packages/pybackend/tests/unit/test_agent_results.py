@@ -0,0 +1,77 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from agent_results import (
+    HistoryMessage,
+    ResponsePart,
+    format_epoch_milliseconds,
+    format_epoch_milliseconds_uncached,
+)
+
+
+class TestFrontendFormat:
+    def test_response_part_includes_only_set_fields(self):
+        part = ResponsePart(
+            text="Done",
+            timestamp=1736766000123,
+            part_type="final",
+            part_id="prt_1",
+            call_id="call_1",
+        )
+        bare = ResponsePart(text="Hi", timestamp=None, part_type="thinking")
+
+        assert part.to_frontend_format() == {
+            "text": "Done",
+            "type": "final",
+            "timestamp": "2025-01-13T11:00:00.123Z",
+            "partId": "prt_1",
+            "callId": "call_1",
+        }
+        assert bare.to_frontend_format() == {"text": "Hi", "type": "thinking"}
+
+    def test_history_message_timestamp_and_ids(self):
+        untimed = HistoryMessage(
+            message_id=None,
+            role="user",
+            content_type="text",
+            content="Hello",
+            timestamp=None,
+        )
+        timed = HistoryMessage(
+            message_id="msg_1",
+            role="assistant",
+            content_type="tool",
+            content="Ran ls",
+            timestamp=951782400000,
+            call_id="call_1",
+        )
+
+        assert untimed.to_frontend_format() == {
+            "role": "user",
+            "type": "text",
+            "content": "Hello",
+            "timestamp": None,
+        }
+        assert timed.to_frontend_format() == {
+            "role": "assistant",
+            "type": "tool",
+            "content": "Ran ls",
+            "messageId": "msg_1",
+            "timestamp": "2000-02-29T00:00:00.000Z",
+            "callId": "call_1",
+        }
+
+
+class TestFormatEpochMilliseconds:
+    @pytest.mark.parametrize("millis", [0, 999, 1736766000123, 951782400000])
+    def test_matches_datetime_isoformat(self, millis):
+        expected = (
+            datetime.fromtimestamp(millis / 1000, tz=UTC)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z")
+        )
+
+        assert format_epoch_milliseconds(millis) == expected
+        assert format_epoch_milliseconds(float(millis)) == expected
+        assert format_epoch_milliseconds_uncached(millis) == expected
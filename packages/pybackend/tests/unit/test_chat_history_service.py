@@ -1,3 +1,5 @@
+from datetime import UTC, datetime
+
 import pytest
 
 from agent_service import (
@@ -14,6 +16,8 @@ class TestTimestampHelpers:
         "raw,expected",
         [
             ("1000", 1000),
+            (1736766000123, 1736766000123),
+            (True, 1),
             (1000.5, 1000),
             (None, None),
             ("bad", None),
@@ -26,6 +30,22 @@ class TestTimestampHelpers:
         assert _format_timestamp(0) == "1970-01-01T00:00:00.000Z"
         assert _format_timestamp_optional(None) is None
 
+    @pytest.mark.parametrize(
+        "raw", [1, 999, 1736766000123, "1736766000123", 1736766000123.9, 951782400000]
+    )
+    def test_format_timestamp_matches_datetime_isoformat(self, raw):
+        expected = (
+            datetime.fromtimestamp(float(raw) / 1000, tz=UTC)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z")
+        )
+        assert _format_timestamp(raw) == expected
+
+    def test_format_timestamp_invalid_uses_current_time(self):
+        formatted = _format_timestamp("bad")
+        assert formatted.startswith(f"{datetime.now(UTC).year:04d}-")
+        assert formatted.endswith("Z")
+
     def test_resolve_message_timestamp(self):
         message = {"time": {"created": 1234, "completed": 2000}}
         assert _resolve_message_timestamp(message) == 1234
@@ -57,6 +57,19 @@ invalid json line here
         assert len(response_parts) == 1
         assert response_parts[0].text == "Valid response"
 
+    def test_parse_codex_output_keeps_unicode_line_separators(self):
+        """Test U+2028 inside a message doesn't split the JSON line."""
+        cli = CodexAgentCLI()
+        mock_stdout = (
+            '{"type": "thread.started", "thread_id": "session-123"}\n'
+            '{"type": "item.completed", "item": {"text": "First\u2028Second"}}\n'
+        )
+
+        session_id, response_parts = cli._parse_codex_output(mock_stdout)
+
+        assert session_id == "session-123"
+        assert [part.text for part in response_parts] == ["First\u2028Second"]
+
     def test_parse_codex_output_empty(self):
         """Test parsing of empty codex output."""
         cli = CodexAgentCLI()
@@ -68,6 +68,14 @@ class TestCopilotAgentCLI:
         assert cli._clean_response_text(text) == "Hello there"
         assert cli._clean_response_text(">     (Heading) Title") == "Title"
 
+    def test_clean_response_text_multiline_and_plain(self):
+        """Test _clean_response_text strips per line and keeps plain text."""
+        cli = CopilotAgentCLI()
+        text = "First line\n> (Assistant) Second line\n(Note) Third"
+        assert cli._clean_response_text(text) == "First line\nSecond line\nThird"
+        plain = "Copilot: a > b (c) d"
+        assert cli._clean_response_text(plain) == plain
+
     @unittest.mock.patch("subprocess.run")
     def test_run_agent_success(self, mock_run):
         """Test run_agent with successful subprocess execution."""
@@ -260,6 +268,61 @@ class TestCopilotAgentCLI:
                 assert session.session_id == "test-session-123"
                 assert "Test message" in session.title
 
+    def test_list_sessions_rereads_title_only_when_log_changes(self):
+        """Test list_sessions reuses titles until events.jsonl is written."""
+        with tempfile.TemporaryDirectory() as temp_copilot_home:
+            sessions_dir = Path(temp_copilot_home) / "session-state"
+            session_dir = sessions_dir / "title-session"
+            session_dir.mkdir(parents=True)
+            events_file = session_dir / "events.jsonl"
+            events_file.write_text(
+                json.dumps({"type": "user.message", "data": {"content": "First"}})
+                + "\n"
+            )
+
+            with unittest.mock.patch.object(
+                CopilotAgentCLI, "_get_sessions_directory", return_value=sessions_dir
+            ):
+                cli = CopilotAgentCLI()
+                assert cli.list_sessions(None).sessions[0].title == "First"
+
+                with unittest.mock.patch("builtins.open") as mock_open:
+                    assert cli.list_sessions(None).sessions[0].title == "First"
+                    mock_open.assert_not_called()
+
+                events_file.write_text(
+                    json.dumps({"type": "user.message", "data": {"content": "Edited"}})
+                    + "\n"
+                )
+                assert cli.list_sessions(None).sessions[0].title == "Edited"
+
+    def test_list_sessions_tolerates_corrupt_event_logs(self):
+        """Test malformed events give a default title instead of failing the list."""
+        with tempfile.TemporaryDirectory() as temp_copilot_home:
+            sessions_dir = Path(temp_copilot_home) / "session-state"
+            logs = {
+                "good-session": {"type": "user.message", "data": {"content": "Hi"}},
+                "list-session": [1, 2],
+                "data-session": {"type": "user.message", "data": "oops"},
+            }
+            for session_id, event in logs.items():
+                session_dir = sessions_dir / session_id
+                session_dir.mkdir(parents=True)
+                (session_dir / "events.jsonl").write_text(json.dumps(event) + "\n")
+
+            with unittest.mock.patch.object(
+                CopilotAgentCLI, "_get_sessions_directory", return_value=sessions_dir
+            ):
+                result = CopilotAgentCLI().list_sessions(None)
+
+            titles = {s.session_id: s.title for s in result.sessions}
+            assert result.success is True
+            assert titles == {
+                "good-session": "Hi",
+                "list-session": "New conversation",
+                "data-session": "New conversation",
+            }
+
     def test_list_agents_success(self):
         """Test list_agents returns default copilot agent."""
         cli = CopilotAgentCLI()
@@ -408,6 +471,23 @@ class TestCopilotAgentCLI:
         # Clean up
         events_file.unlink()
 
+    def test_parse_events_jsonl_message_ids_use_line_numbers(self):
+        """Test _parse_events_jsonl keeps line numbers across blank lines."""
+        cli = CopilotAgentCLI()
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
+            f.write('{"type": "user.message", "data": {"content": "First"}}\n')
+            f.write("\n")
+            f.write('{"type": "assistant.message", "data": {"content": "Second"}}\n')
+            events_file = Path(f.name)
+
+        messages = cli._parse_events_jsonl(events_file)
+
+        assert [m.message_id for m in messages] == ["user-1", "assistant-3"]
+
+        # Clean up
+        events_file.unlink()
+
     def test_parse_events_jsonl_empty_content_with_tool_requests(self):
         """Test _parse_events_jsonl extracts tool call info when content is empty."""
         cli = CopilotAgentCLI()
@@ -600,6 +680,77 @@ class TestCopilotAgentCLI:
                     is False
                 )
 
+    def test_session_matches_directory_reuses_recorded_cwd(self):
+        """Test the session.start cwd is read once and then served from cache."""
+        cli = CopilotAgentCLI()
+
+        with tempfile.TemporaryDirectory() as temp_copilot_home:
+            sessions_dir = Path(temp_copilot_home) / "session-state"
+            session_dir = sessions_dir / "cached-session"
+            session_dir.mkdir(parents=True)
+            events_file = session_dir / "events.jsonl"
+            session_start_event = {
+                "type": "session.start",
+                "data": {"context": {"cwd": "/workspace/project"}},
+            }
+            events_file.write_text(json.dumps(session_start_event) + "\n")
+
+            with unittest.mock.patch.object(
+                CopilotAgentCLI, "_get_sessions_directory", return_value=sessions_dir
+            ):
+                workspace = Path("/workspace/project")
+                assert cli._session_matches_directory("cached-session", workspace)
+
+                with unittest.mock.patch("builtins.open") as mock_open:
+                    assert cli._session_matches_directory("cached-session", workspace)
+                    assert not cli._session_matches_directory(
+                        "cached-session", Path("/elsewhere")
+                    )
+                    mock_open.assert_not_called()
+
+    def test_session_matches_directory_rereads_rewritten_log(self):
+        """Test a rewritten session.start event is not served from a stale cache."""
+        cli = CopilotAgentCLI()
+
+        with tempfile.TemporaryDirectory() as temp_copilot_home:
+            sessions_dir = Path(temp_copilot_home) / "session-state"
+            session_dir = sessions_dir / "moved-session"
+            session_dir.mkdir(parents=True)
+            events_file = session_dir / "events.jsonl"
+            events_file.write_text(
+                json.dumps(
+                    {
+                        "type": "session.start",
+                        "data": {"context": {"cwd": "/workspace/project"}},
+                    }
+                )
+                + "\n"
+            )
+
+            with unittest.mock.patch.object(
+                CopilotAgentCLI, "_get_sessions_directory", return_value=sessions_dir
+            ):
+                assert cli._session_matches_directory(
+                    "moved-session", Path("/workspace/project")
+                )
+
+                events_file.write_text(
+                    json.dumps(
+                        {
+                            "type": "session.start",
+                            "data": {"context": {"cwd": "/workspace/other-project"}},
+                        }
+                    )
+                    + "\n"
+                )
+
+                assert not cli._session_matches_directory(
+                    "moved-session", Path("/workspace/project")
+                )
+                assert cli._session_matches_directory(
+                    "moved-session", Path("/workspace/other-project")
+                )
+
     def test_list_sessions_filters_by_workspace(self):
         """Test that list_sessions only returns sessions from current workspace."""
         cli = CopilotAgentCLI()
@@ -692,6 +843,31 @@ class TestCopilotAgentCLI:
                 result = cli._get_sessions_directory()
                 assert result == custom_path
 
+    def test_get_sessions_directory_caches_resolved_path(self):
+        """Test _get_sessions_directory reuses its lookup until the env var changes."""
+        cli = CopilotAgentCLI()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_path = Path(temp_dir) / "first"
+            second_path = Path(temp_dir) / "second"
+            first_path.mkdir()
+            second_path.mkdir()
+
+            with unittest.mock.patch.dict(
+                "os.environ", {"COPILOT_SESSION_PATH": str(first_path)}
+            ):
+                assert cli._get_sessions_directory() == first_path
+                with unittest.mock.patch(
+                    "copilot_agent_cli.Path.exists",
+                    side_effect=AssertionError("unexpected filesystem probe"),
+                ):
+                    assert cli._get_sessions_directory() == first_path
+
+            with unittest.mock.patch.dict(
+                "os.environ", {"COPILOT_SESSION_PATH": str(second_path)}
+            ):
+                assert cli._get_sessions_directory() == second_path
+
     @unittest.mock.patch("pathlib.Path.home")
     def test_get_sessions_directory_default_location(self, mock_home):
         """Test _get_sessions_directory with default location."""
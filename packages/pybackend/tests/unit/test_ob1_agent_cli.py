@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import Mock, patch, mock_open
 import json
+import tempfile
 from pathlib import Path
 
 from ob1_agent_cli import OB1AgentCLI
@@ -233,6 +234,24 @@ class TestOB1AgentCLI(unittest.TestCase):
         self.assertEqual(result.messages[1].role, "assistant")
         self.assertEqual(result.messages[1].content, "Hi there!")
 
+    def test_export_session_reads_utf8_session_file(self):
+        """Test export_session decodes a real UTF-8 session file from disk."""
+        session_data = {
+            "exchanges": [{"user": {"content": "Grüße", "timestamp_ms": 1000}}]
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            session_file = Path(tmp_dir) / "session-utf8.json"
+            session_file.write_bytes(
+                json.dumps(session_data, ensure_ascii=False).encode("utf-8")
+            )
+            with patch.object(
+                self.cli, "_find_ob1_session_files", return_value=[session_file]
+            ):
+                result = self.cli.export_session("utf8", Path("."))
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.messages[0].content, "Grüße")
+
     def test_export_session_not_found(self):
         """Test export_session when session is not found."""
         with patch.object(self.cli, "_find_ob1_session_files", return_value=[]):
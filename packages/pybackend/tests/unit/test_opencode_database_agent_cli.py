@@ -559,6 +559,20 @@ class TestOpenCodeDatabaseAgentCLI(unittest.TestCase):
         self.assertEqual(result.response_parts[0].text, "Hello response")
         self.assertEqual(result.response_parts[0].part_type, "final")
 
+    def test_parse_opencode_output_skips_non_json_lines(self):
+        """Test that banner and log lines are ignored when parsing output."""
+        stdout = (
+            "opencode v1.0.0\n"
+            "[info] connecting\n"
+            '  {"sessionID": "ses_123", "part": {"type": "text", "text": "Hi"}}\n'
+            "{truncated\n"
+        )
+
+        session_id, parts = self.cli._parse_opencode_output(stdout)
+
+        self.assertEqual(session_id, "ses_123")
+        self.assertEqual([part.text for part in parts], ["Hi"])
+
     @patch("opencode_database_agent_cli.subprocess.run")
     def test_run_agent_command_failure(self, mock_subprocess_run):
         """Test agent execution when CLI command fails."""
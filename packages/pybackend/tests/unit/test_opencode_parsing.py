@@ -1,6 +1,11 @@
 """Unit tests for OpenCodeAgentCLI parsing functions."""
 
+import subprocess
+import sys
 import unittest
+from pathlib import Path
+from threading import Event, Timer
+from unittest.mock import patch
 
 from opencode_legacy_agent_cli import OpenCodeAgentCLI
 
@@ -27,6 +32,12 @@ class TestOpenCodeAgentCLIParsing(unittest.TestCase):
         result = self.cli._extract_part_content(part, "tool_use")
         assert result == "search"
 
+    def test_extract_part_content_fallbacks(self):
+        """Test _extract_part_content falls back by key and ignores unknown types."""
+        assert self.cli._extract_part_content({"tool": "", "id": 42}, "tool") == "42"
+        assert self.cli._extract_part_content({"text": "thought"}, "reasoning") == ""
+        assert self.cli._extract_part_content({}, "text") == ""
+
     def test_parse_opencode_output_simple(self):
         """Test _parse_opencode_output with simple text."""
         stdout = '{"type":"text","timestamp":1000,"sessionID":"ses_123","part":{"type":"text","text":"Hello"}}'
@@ -68,6 +79,47 @@ class TestOpenCodeAgentCLIParsing(unittest.TestCase):
         assert parts[1].text == "bash"
         assert parts[2].part_type == "final"
 
+    def test_parse_opencode_output_skips_non_json_lines(self):
+        """Test _parse_opencode_output ignores banners, logs and non-object JSON."""
+        stdout = '\n'.join([
+            'opencode v1.0.0',
+            'INFO starting session',
+            '[1, 2, 3]',
+            '  {"type":"text","timestamp":1000,"sessionID":"ses_123","part":{"text":"Hello"}}',
+            '{not json',
+        ])
+        session_id, parts = self.cli._parse_opencode_output(stdout)
+
+        assert session_id == "ses_123"
+        assert len(parts) == 1
+        assert parts[0].text == "Hello"
+
+    def test_parse_opencode_output_skips_metadata_events(self):
+        """Test metadata events are ignored and may still supply the session ID."""
+        stdout = "\n".join([
+            '{"type":"step_start","sessionID":"ses_1","part":{"type":"step-start"}}',
+            '{"type":"step_finish","sessionID":"ses_1","part":{"cost":0}}',
+            '{"type":"reasoning","sessionID":"ses_1","part":{"text":"hmm"}}',
+            '{"type":"tool_use","sessionID":"ses_1","part":{"tool":"bash"}}',
+            '{"type":"text","sessionID":"ses_1","part":{"text":"Done"}}',
+        ])
+        session_id, parts = self.cli._parse_opencode_output(stdout)
+
+        assert session_id == "ses_1"
+        assert [p.part_type for p in parts] == ["thinking", "tool", "final"]
+        assert parts[2].text == "Done"
+
+    def test_parse_opencode_output_bytes(self):
+        """Test _parse_opencode_output accepts raw UTF-8 bytes from the pipe."""
+        stdout = (
+            b'warming up\n'
+            b'{"type":"text","sessionID":"ses_1","part":{"text":"Caf\xc3\xa9"}}\n'
+        )
+        session_id, parts = self.cli._parse_opencode_output(stdout)
+
+        assert session_id == "ses_1"
+        assert [p.text for p in parts] == ["Caf\u00e9"]
+
     def test_parse_session_table(self):
         """Test _parse_session_table parsing."""
         output = """Session ID                      Title                           Updated
@@ -82,6 +134,48 @@ ses_456def                      Another session                 2025-01-02 11:00
         assert sessions[0].title == "Test session"
         assert sessions[0].updated == "2025-01-01 10:00"
 
+    def test_parse_session_table_irregular_rows(self):
+        """Test rows the column split declines still parse via the row pattern."""
+        output = "\n".join(
+            [
+                "ses_1      Plain row      2025-01-01 10:00",
+                "ses_2\t\tTabbed\t\t2025-01-02 11:00",
+                "ses_3        2025-01-03 12:00",
+                "ses_4 no gaps here",
+            ]
+        )
+
+        sessions = self.cli._parse_session_table(output, 10)
+
+        assert [(s.session_id, s.title, s.updated) for s in sessions] == [
+            ("ses_1", "Plain row", "2025-01-01 10:00"),
+            ("ses_2", "Tabbed", "2025-01-02 11:00"),
+            ("ses_3", "", "2025-01-03 12:00"),
+        ]
+
+    def test_parse_session_table_stops_at_limit(self):
+        """Test _parse_session_table returns at most limit sessions."""
+        output = "\n".join(
+            f"ses_{index:03d}      Session {index}      2025-01-01 10:00"
+            for index in range(100)
+        )
+
+        sessions = self.cli._parse_session_table(output, 3)
+
+        assert [s.session_id for s in sessions] == ["ses_000", "ses_001", "ses_002"]
+        assert sessions[0].updated == "2025-01-01 10:00"
+
+    def test_parse_session_table_logs_unmatched_rows_at_debug(self):
+        """Test _parse_session_table logs unmatched rows but not headers."""
+        output = "Session ID   Title   Updated\nnot a session row\n"
+
+        with self.assertLogs("opencode_legacy_agent_cli", level="DEBUG") as logs:
+            sessions = self.cli._parse_session_table(output, 10)
+
+        assert sessions == []
+        assert len(logs.output) == 1
+        assert "not a session row" in logs.output[0]
+
     def test_parse_agent_list(self):
         """Test _parse_agent_list parsing."""
         output = """build (primary)
@@ -157,5 +251,181 @@ plan (secondary)
         assert result == 3000
 
 
+class TestOpenCodeAgentCLIStreaming(unittest.TestCase):
+    """Test run_agent streaming of opencode output."""
+
+    def _run_with_script(
+        self,
+        script,
+        cancel_event=None,
+        on_process=lambda process: None,
+        message="hello",
+    ):
+        """Run the agent with a Python script standing in for opencode."""
+        real_popen = subprocess.Popen
+        processes = []
+
+        def fake_popen(command, **kwargs):
+            process = real_popen([sys.executable, "-c", script], **kwargs)
+            processes.append(process)
+            return process
+
+        with patch("opencode_legacy_agent_cli.subprocess.Popen", fake_popen):
+            result = OpenCodeAgentCLI().run_agent(
+                message,
+                None,
+                None,
+                None,
+                Path("."),
+                cancel_event=cancel_event,
+                on_process=on_process,
+            )
+        return result, processes[0]
+
+    def test_run_agent_streams_stdout(self):
+        """Test run_agent parses events streamed by the process."""
+        script = (
+            "import sys\n"
+            "prompt = sys.stdin.read()\n"
+            "print('{\"type\":\"text\",\"sessionID\":\"ses_1\",'"
+            " '\"part\":{\"text\":\"thinking\"}}', flush=True)\n"
+            "print('{\"type\":\"text\",\"sessionID\":\"ses_1\",'"
+            " '\"part\":{\"text\":\"echo ' + prompt + '\"}}')\n"
+            "print('a warning', file=sys.stderr)\n"
+        )
+        result, _ = self._run_with_script(script)
+
+        assert result.success is True
+        assert result.session_id == "ses_1"
+        assert [p.text for p in result.response_parts] == ["thinking", "echo hello"]
+        assert [p.part_type for p in result.response_parts] == ["thinking", "final"]
+
+    def test_run_agent_streams_without_callbacks(self):
+        """Test run_agent streams output even without cancel or process hooks."""
+        script = (
+            "import sys\n"
+            "sys.stdin.read()\n"
+            "print('{\"type\":\"text\",\"sessionID\":\"ses_2\",'"
+            " '\"part\":{\"text\":\"done\"}}')\n"
+        )
+        result, process = self._run_with_script(script, on_process=None)
+
+        assert result.success is True
+        assert result.session_id == "ses_2"
+        assert [p.text for p in result.response_parts] == ["done"]
+        assert process.returncode == 0
+
+    def test_run_agent_large_prompt_does_not_block_output(self):
+        """Test a prompt larger than the pipe buffer can't deadlock the reader."""
+        script = (
+            "import sys\n"
+            "for _ in range(20000):\n"
+            "    print('progress ' + 'x' * 60)\n"
+            "sys.stdout.flush()\n"
+            "prompt = sys.stdin.read()\n"
+            "print('{\"type\":\"text\",\"sessionID\":\"ses_3\",'"
+            " '\"part\":{\"text\":\"' + str(len(prompt)) + '\"}}')\n"
+        )
+        result, process = self._run_with_script(script, message="p" * 1_000_000)
+
+        assert result.success is True
+        assert [p.text for p in result.response_parts] == ["1000000"]
+        assert process.returncode == 0
+
+    def test_run_agent_kills_process_when_parsing_fails(self):
+        """Test a parsing error doesn't leave the process running."""
+        script = "import sys, time\nsys.stdin.read()\ntime.sleep(30)\n"
+        with patch.object(
+            OpenCodeAgentCLI,
+            "_parse_opencode_lines",
+            side_effect=RuntimeError("parse failed"),
+        ):
+            result, process = self._run_with_script(script)
+
+        assert result.success is False
+        assert result.error_message == "Error: parse failed"
+        assert process.returncode is not None
+        assert process.stdout.closed and process.stderr.closed
+
+    def test_run_agent_kills_process_when_on_process_fails(self):
+        """Test a failing on_process hook doesn't leave the process running."""
+        script = "import sys, time\nsys.stdin.read()\ntime.sleep(30)\n"
+
+        def on_process(process):
+            raise RuntimeError("hook failed")
+
+        result, process = self._run_with_script(script, on_process=on_process)
+
+        assert result.success is False
+        assert result.error_message == "Error: hook failed"
+        assert process.returncode is not None
+        assert process.stdout.closed and process.stderr.closed
+
+    def test_run_agent_reports_stderr_on_failure(self):
+        """Test run_agent returns stderr when the process fails."""
+        script = "import sys\nsys.stderr.write('boom')\nsys.exit(2)\n"
+        result, _ = self._run_with_script(script)
+
+        assert result.success is False
+        assert result.error_message == "boom"
+
+    def test_run_agent_cancel_terminates_process(self):
+        """Test setting the cancel event stops a running process."""
+        cancel_event = Event()
+        script = (
+            "import sys, time\n"
+            "sys.stdin.read()\n"
+            "print('started', flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        timer = Timer(0.2, cancel_event.set)
+        timer.start()
+        try:
+            result, process = self._run_with_script(script, cancel_event=cancel_event)
+        finally:
+            timer.cancel()
+
+        assert result.success is False
+        assert result.error_message == "Agent request cancelled."
+        assert process.poll() is not None
+
+
+class TestOpenCodeAgentCLIExport(unittest.TestCase):
+    """Test export_session decoding of opencode export output."""
+
+    @patch("opencode_legacy_agent_cli.subprocess.run")
+    def test_export_session_parses_piped_bytes(self, mock_run):
+        """Test export_session decodes the export payload from stdout bytes."""
+        mock_run.return_value = subprocess.CompletedProcess(
+            args=[],
+            returncode=0,
+            stdout=(
+                b'{"messages": [{"info": {"id": "msg_1", "role": "user"},'
+                b' "parts": [{"type": "text", "text": "Hi \xc3\xa9"}]}]}'
+            ),
+            stderr=b"",
+        )
+
+        result = OpenCodeAgentCLI().export_session("ses_1", Path("."))
+
+        assert result.success is True
+        assert [m.content for m in result.messages] == ["Hi \u00e9"]
+        assert mock_run.call_args.kwargs["stdout"] == subprocess.PIPE
+
+    @patch("opencode_legacy_agent_cli.subprocess.run")
+    def test_export_session_invalid_payload(self, mock_run):
+        """Test export_session reports undecodable export output."""
+        mock_run.return_value = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout=b"not json", stderr=b""
+        )
+
+        with self.assertLogs("opencode_legacy_agent_cli", level="WARNING") as logs:
+            result = OpenCodeAgentCLI().export_session("ses_1", Path("."))
+
+        assert result.success is False
+        assert result.error_message == "Invalid export data returned by opencode"
+        assert "b'not json'" in logs.output[0]
+
+
 if __name__ == "__main__":
     unittest.main()
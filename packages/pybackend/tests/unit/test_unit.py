@@ -79,9 +79,10 @@ class TestAgentService:
     """Test agent service functions in isolation."""
 
     def setup_method(self):
-        """Clear agents cache before each test to prevent cross-test contamination."""
+        """Clear caches before each test to prevent cross-test contamination."""
         import agent_service
         agent_service._AGENTS_CACHE.clear()
+        agent_service._SESSIONS_CACHE.clear()
 
     @patch("agent_service.get_workspace_home")
     def test_get_working_directory_repository_chat(self, mock_get_workspace_home):
@@ -744,6 +745,7 @@ class TestAgentService:
     @patch("agent_service.get_agent_cli")
     def test_list_chat_sessions(self, mock_get_cli):
         """Test listing chat sessions with success and error scenarios."""
+        import agent_service
         from agent_service import list_chat_sessions
         from agent_results import SessionListResult, SessionInfo
 
@@ -771,6 +773,7 @@ class TestAgentService:
         assert result[0]["title"] == "First Session"
 
         # Test error handling
+        agent_service._SESSIONS_CACHE.clear()
         mock_error_result = SessionListResult(
             success=False, sessions=[], error_message="Failed to list sessions"
         )
@@ -779,6 +782,37 @@ class TestAgentService:
         with pytest.raises(RuntimeError, match="Failed to list sessions"):
             list_chat_sessions("test-repo", limit=5)
 
+    @patch("agent_service.get_agent_cli")
+    def test_list_chat_sessions_reuses_recent_listing(self, mock_get_cli):
+        """Test session listings are cached briefly and shared across limits."""
+        import agent_service
+        from agent_service import list_chat_sessions
+        from agent_results import SessionListResult, SessionInfo
+
+        mock_cli = Mock()
+        mock_cli.cli_name = "opencode"
+        mock_get_cli.return_value = mock_cli
+        mock_cli.list_sessions.return_value = SessionListResult(
+            success=True,
+            sessions=[
+                SessionInfo(session_id=f"ses_{i}", title=f"S{i}", updated="now")
+                for i in range(3)
+            ],
+        )
+
+        first = list_chat_sessions(None, limit=3)
+        second = list_chat_sessions(None, limit=1)
+
+        assert [s["id"] for s in first] == ["ses_0", "ses_1", "ses_2"]
+        assert [s["id"] for s in second] == ["ses_0"]
+        mock_cli.list_sessions.assert_called_once()
+
+        # Once the entry is older than the TTL the CLI is asked again
+        for entry in agent_service._SESSIONS_CACHE.values():
+            entry["timestamp"] -= agent_service._SESSIONS_CACHE_TTL_SECONDS + 1
+        list_chat_sessions(None, limit=3)
+        assert mock_cli.list_sessions.call_count == 2
+
     @patch("agent_service.get_agent_cli")
     def test_export_chat_history_missing_session_returns_empty(self, mock_get_cli):
         """Test missing sessions return an empty history payload."""